@@ -224,16 +224,8 @@ import { DB } from "./constants.js";
       type: r[10] || "",
     }));
 
-    // Word-for-word map
-    const wfw = await query(`
-      SELECT t.verse_id,
-             GROUP_CONCAT(
-               COALESCE(t.surface,'') || ' — ' ||
-               COALESCE((SELECT gloss FROM verse_glosses g
-                         WHERE g.verse_id=t.verse_id AND g.surface=t.surface LIMIT 1),'')
-             , '; ') AS wfw
-      FROM tokens t GROUP BY t.verse_id
-    `);
+    // Word-for-word map (pre-rendered by the importer)
+    const wfw = await query(`SELECT verse_id, wfw FROM verse_wfw`);
     ALL.wfwByVerse = new Map();
     if (wfw.rows)
       for (const row of wfw.rows) ALL.wfwByVerse.set(row[0], row[1] || "");
@@ -12,6 +12,43 @@ async function getOPFSFileBuffer(dirName, fileName) {
   return new Uint8Array(await file.arrayBuffer());
 }
 
+// IEEE half -> float (for meta.vector_format "f16" / "sparse-u16-f16")
+function halfToFloat(h) {
+  const exp = (h >> 10) & 0x1f;
+  const frac = h & 0x3ff;
+  const sign = h & 0x8000 ? -1 : 1;
+  if (exp === 0) return sign * frac * 2 ** -24;
+  if (exp === 0x1f) return frac ? NaN : sign * Infinity;
+  return sign * (1 + frac / 1024) * 2 ** (exp - 15);
+}
+
+// Write one stored embedding into out[offset .. offset+dim) as dense float32.
+function decodeVector(blob, format, out, offset, dim) {
+  if (format === "sparse-u16-f16") {
+    // n uint16 indices, then n float16 values (little-endian)
+    const view = new DataView(blob.buffer, blob.byteOffset, blob.byteLength);
+    const n = blob.byteLength >> 2;
+    for (let k = 0; k < n; k += 1) {
+      const j = view.getUint16(2 * k, true);
+      if (j < dim) out[offset + j] = halfToFloat(view.getUint16(2 * n + 2 * k, true));
+    }
+    return;
+  }
+  if (format === "f16") {
+    const view = new DataView(blob.buffer, blob.byteOffset, blob.byteLength);
+    for (let j = 0; j < dim; j += 1) out[offset + j] = halfToFloat(view.getUint16(2 * j, true));
+    return;
+  }
+  if (format === "int8") {
+    // float32 scale, then dim int8 values: v = q * scale
+    const view = new DataView(blob.buffer, blob.byteOffset, blob.byteLength);
+    const scale = view.getFloat32(0, true);
+    for (let j = 0; j < dim; j += 1) out[offset + j] = view.getInt8(4 + j) * scale;
+    return;
+  }
+  out.set(new Float32Array(blob.buffer, blob.byteOffset, blob.byteLength / 4), offset);
+}
+
 let sqlPromise = null;
 function loadSqlModule() {
   if (!sqlPromise) {
@@ -76,38 +113,82 @@ export class SemanticDB {
     }
     passStmt.free();
 
-    const vecStmt = db.prepare("SELECT id, vector FROM embeddings ORDER BY id");
-    const matrix = new Float32Array(ids.length * this.dim);
-    const idIndex = new Map(ids.map((id, idx) => [id, idx]));
-    while (vecStmt.step()) {
-      const row = vecStmt.getAsObject();
-      const id = Number(row.id);
-      const idx = idIndex.get(id);
-      if (idx === undefined) continue;
-      const blob = row.vector; // Uint8Array
-      const view = new Float32Array(
-        blob.buffer,
-        blob.byteOffset,
-        blob.byteLength / 4
-      );
-      matrix.set(view, idx * this.dim);
+    // Finished packs keep their vectors in embedding_matrix (a few chunk blobs) and leave
+    // embeddings empty; older packs still have per-row embeddings, which take precedence.
+    const format = this.meta.get("vector_format") || "f32";
+    const hasMatrix =
+      db.exec("SELECT 1 FROM embeddings LIMIT 1").length === 0 &&
+      db.exec("SELECT 1 FROM sqlite_master WHERE type='table' AND name='embedding_matrix'").length > 0;
+    let matrix;
+    let rowIds = ids;
+    if (hasMatrix) {
+      // Stored vectors concatenated per chunk + uint32 ids; offsets only for variable-length rows
+      const chunks = [];
+      let total = 0;
+      const chunkStmt = db.prepare("SELECT * FROM embedding_matrix ORDER BY chunk");
+      while (chunkStmt.step()) {
+        const row = chunkStmt.getAsObject();
+        chunks.push({
+          nRows: Number(row.n_rows),
+          idBlob: row.ids,
+          offBlob: row.offsets || null,
+          vecBlob: row.vectors,
+        });
+        total += Number(row.n_rows);
+      }
+      chunkStmt.free();
+      // f32: a single chunk is viewed without copying
+      matrix =
+        format === "f32" && chunks.length === 1 && chunks[0].vecBlob.byteOffset % 4 === 0
+          ? new Float32Array(chunks[0].vecBlob.buffer, chunks[0].vecBlob.byteOffset, total * this.dim)
+          : new Float32Array(total * this.dim);
+      rowIds = new Array(total);
+      let row = 0;
+      for (const { nRows, idBlob, offBlob, vecBlob } of chunks) {
+        if (format === "f32") {
+          if (matrix.buffer !== vecBlob.buffer) {
+            new Uint8Array(matrix.buffer, row * this.dim * 4, vecBlob.byteLength).set(vecBlob);
+          }
+        } else {
+          const offView = offBlob && new DataView(offBlob.buffer, offBlob.byteOffset, offBlob.byteLength);
+          const size = vecBlob.byteLength / nRows;
+          for (let k = 0; k < nRows; k += 1) {
+            const start = offView ? offView.getUint32(4 * k, true) : k * size;
+            const end = offView ? offView.getUint32(4 * k + 4, true) : start + size;
+            decodeVector(vecBlob.subarray(start, end), format, matrix, (row + k) * this.dim, this.dim);
+          }
+        }
+        const idView = new DataView(idBlob.buffer, idBlob.byteOffset, idBlob.byteLength);
+        for (let k = 0; k < nRows; k += 1) rowIds[row + k] = idView.getUint32(4 * k, true);
+        row += nRows;
+      }
+    } else {
+      const vecStmt = db.prepare("SELECT id, vector FROM embeddings ORDER BY id");
+      matrix = new Float32Array(ids.length * this.dim);
+      const idIndex = new Map(ids.map((id, idx) => [id, idx]));
+      while (vecStmt.step()) {
+        const row = vecStmt.getAsObject();
+        const id = Number(row.id);
+        const idx = idIndex.get(id);
+        if (idx === undefined) continue;
+        const blob = row.vector; // Uint8Array
+        decodeVector(blob, format, matrix, idx * this.dim, this.dim);
+      }
+      vecStmt.free();
     }
-    vecStmt.free();
     db.close();
 
-    this.ids = ids;
+    this.ids = rowIds;
     this.passages = passages;
     // Ensure rows are unit-normalized so dot product == cosine
-    {
-      const dim = this.dim;
-      for (let row = 0; row < ids.length; row += 1) {
-        let norm = 0;
-        const off = row * dim;
-        for (let j = 0; j < dim; j += 1) norm += matrix[off + j] * matrix[off + j];
-        norm = Math.sqrt(norm) || 1;
-        if (norm !== 1) {
-          for (let j = 0; j < dim; j += 1) matrix[off + j] /= norm;
-        }
+    const dim = this.dim;
+    for (let row = 0; row < rowIds.length; row += 1) {
+      let norm = 0;
+      const off = row * dim;
+      for (let j = 0; j < dim; j += 1) norm += matrix[off + j] * matrix[off + j];
+      norm = Math.sqrt(norm) || 1;
+      if (norm !== 1) {
+        for (let j = 0; j < dim; j += 1) matrix[off + j] /= norm;
       }
     }
     this.embeddingMatrix = matrix;
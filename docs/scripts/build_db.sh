@@ -11,7 +11,7 @@ source .venv/bin/activate
 
 # upgrade pip and install deps
 python -m pip install -U pip
-pip install numpy onnxruntime tokenizers
+pip install numpy onnxruntime tokenizers onnx
 
 # run your pipeline
 python run.py
@@ -41,23 +41,28 @@ python json_to_sqlite_cli.py \
 
 ### What it does
 
-* Creates a future-proof schema (works, divisions, verses, editions, verse\_texts, tokens, verse\_glosses, FTS + a wide view).
+* Creates a future-proof schema (works, divisions, verses, editions, verse\_texts, tokens, verse\_glosses, FTS + a one-row-per-verse wide table).
 * Reads each JSON (supports `{"books":[...]}`, a single work object, or a top-level list).
 * Takes **`type`** directly from your JSON per work (no hardcoding).
-* Stores **Devanāgarī / IAST / English as separate editions** and also provides a **`verse_texts_wide` view** for one-row-per-verse display.
-* Saves **word-by-word meanings per verse** (`verse_glosses`) so context never overwrites.
+* Stores **Devanāgarī / IAST / English as separate editions** and also provides **`verse_texts_wide`** for one-row-per-verse display: a table written alongside `verse_texts` (keyed on `verse_id`, indexed on `(work_id, division_id)`), or the original `GROUP BY` view with `--wide-view`.
+* Saves **word-by-word meanings per verse** (`verse_glosses`) so context never overwrites, plus a pre-rendered **`verse_wfw`** row per verse (display string + `[[surface, gloss], ...]` JSON) so the site needs no per-token gloss subqueries.
 * Future: CLI flags to force a specific `type` override, auto-infer chapter labels, or stricter JSON key validation.
 
 * **Schema guard:** Before running `CREATE TABLE ...`, the script checks `sqlite_master` for `works`. If present, it **skips** schema creation (avoids errors).
 * **Append mode:** `--no_reset` prevents deleting the DB if it exists.
 * **Idempotent work insert:** It checks `works.slug` first; if found, it **reuses** that `work_id` instead of inserting a duplicate.
+* **Bulk ingest:** `--bulk` collects each chapter's verses, texts, tokens, glosses and FTS rows and writes them with one `executemany` per table (same resulting DB, far fewer statement round-trips). An ingest rate (verses/sec) is printed at the end.
+* **Fast build:** `--fast-build` imports everything in one transaction with `journal_mode=OFF` (`MEMORY` with `--no_reset`), `synchronous=OFF`, a 256 MiB page cache and foreign keys off; indexes are created after the load, followed by a single `PRAGMA foreign_key_check` and `ANALYZE`.
+* **Parallel parse:** `--workers N` loads and normalizes JSON files in N processes while the main thread, the only SQLite writer, drains a bounded queue of flattened row tuples (bulk path; work_ids follow file order as in a serial run).
+* **Streaming:** `--stream` walks `chapters[*]` incrementally and writes each chapter as it is decoded, so peak memory is bounded by one chapter instead of the whole book. Work fields must come before `"chapters"` in the JSON.
+* **Incremental rebuild:** `--incremental` keeps the DB and records each source file's path, size, mtime and sha256 (plus its work_id) in `build_state`. Unchanged files are skipped; a changed file's work has its divisions/verses/texts/tokens/glosses replaced in one transaction, so re-importing never duplicates rows under the same slug. Works whose recorded source file was deleted are dropped. FTS is rebuilt from `verse_texts` only when an existing work was replaced.
 
 - Accepts multiple JSON files (via --json ... or --dir + --pattern)
 - Appends all works into one SQLite DB
 - Reads "type" per work straight from JSON (no hardcoded categories)
 - Adds a work_types table for site filters; works references it via work_type_code
 - Stores origin/published dates on works
-- Keeps text variants normalized (editions + verse_texts) and exposes a 'wide' view
+- Keeps text variants normalized (editions + verse_texts) and exposes a 'wide' table (or view)
 - Stores word-by-word meanings per verse (verse_glosses)
 
 ### JSON shapes supported:
@@ -71,9 +76,11 @@ python json_to_sqlite_cli.py \
 * If JSON schema varies across files, the flexible key mapping (Devanāgarī/IAST/English) will still apply, so you can mix sources.
 
 """
-import argparse, os, sqlite3, re, json, glob
+import argparse, os, sqlite3, re, json, glob, time, queue, threading, hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 ROOT = Path(__file__).resolve().parent.parent  # -> docs/
 DEFAULT_DB_PATH = ROOT / "assets" / "data" / "library.{{DB_VERSION}}.sqlite"
@@ -86,6 +93,18 @@ def parse_args(argv=None):
     p.add_argument("--dir", dest="indir", default=DEFAULT_JSON_DIR, help="Directory to scan for JSON files.")
     p.add_argument("--pattern", default="*.json", help="Glob pattern within --dir (default: *.json).")
     p.add_argument("--no_reset", action="store_true", help="Append into existing DB (do not delete).")
+    p.add_argument("--bulk", action="store_true", help="Batch each chapter's rows and write them with executemany.")
+    p.add_argument("--wide-view", dest="wide_view", action="store_true",
+                   help="Keep verse_texts_wide as the GROUP BY view instead of a materialized table.")
+    p.add_argument("--incremental", action="store_true",
+                   help="Keep the DB, skip unchanged JSON files and replace only the works whose source changed.")
+    p.add_argument("--fast-build", dest="fast_build", action="store_true",
+                   help="Single transaction, no journal/sync, FK check and indexes after the load.")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--workers", type=int, default=0,
+                      help="Parse JSON files in N processes while one writer fills SQLite (implies --bulk).")
+    mode.add_argument("--stream", action="store_true",
+                      help="Read each file chapter by chapter instead of json.load (implies --bulk).")
     return p.parse_args(argv)
 
 def slugify(s: str) -> str:
@@ -122,7 +141,7 @@ def f_parse_origin_range(text: Optional[str]) -> Tuple[Optional[int], Optional[i
         return (-year, -year) if era=="bce" else (year, year)
     return (None, None)
 
-SCHEMA_SQL = """
+TABLES_SQL = """
 PRAGMA foreign_keys = ON;
 CREATE TABLE IF NOT EXISTS work_types (code TEXT PRIMARY KEY, label TEXT NOT NULL, description TEXT);
 CREATE TABLE IF NOT EXISTS works (
@@ -146,7 +165,6 @@ CREATE TABLE IF NOT EXISTS divisions (
   label TEXT,
   slug TEXT
 );
-CREATE INDEX IF NOT EXISTS idx_divisions_work ON divisions(work_id);
 CREATE TABLE IF NOT EXISTS verses (
   verse_id INTEGER PRIMARY KEY,
   work_id INTEGER NOT NULL REFERENCES works(work_id) ON DELETE CASCADE,
@@ -154,7 +172,6 @@ CREATE TABLE IF NOT EXISTS verses (
   ref_citation TEXT,
   ordinal INTEGER
 );
-CREATE INDEX IF NOT EXISTS idx_verses_division ON verses(division_id, ordinal);
 CREATE TABLE IF NOT EXISTS editions (
   edition_id INTEGER PRIMARY KEY,
   work_id INTEGER NOT NULL REFERENCES works(work_id) ON DELETE CASCADE,
@@ -164,7 +181,6 @@ CREATE TABLE IF NOT EXISTS editions (
   translator TEXT,
   is_default INTEGER DEFAULT 1
 );
-CREATE UNIQUE INDEX IF NOT EXISTS idx_editions_uniq ON editions(work_id, kind, language, IFNULL(script,''), IFNULL(translator,''));
 CREATE TABLE IF NOT EXISTS verse_texts (
   verse_id INTEGER NOT NULL REFERENCES verses(verse_id) ON DELETE CASCADE,
   edition_id INTEGER NOT NULL REFERENCES editions(edition_id) ON DELETE CASCADE,
@@ -172,7 +188,6 @@ CREATE TABLE IF NOT EXISTS verse_texts (
   notes_json TEXT,
   PRIMARY KEY (verse_id, edition_id)
 );
-CREATE INDEX IF NOT EXISTS idx_verse_texts_edition ON verse_texts(edition_id);
 CREATE TABLE IF NOT EXISTS verse_glosses (
   work_id INTEGER NOT NULL REFERENCES works(work_id) ON DELETE CASCADE,
   verse_id INTEGER NOT NULL REFERENCES verses(verse_id) ON DELETE CASCADE,
@@ -181,8 +196,6 @@ CREATE TABLE IF NOT EXISTS verse_glosses (
   source TEXT,
   UNIQUE(verse_id, surface, gloss)
 );
-CREATE INDEX IF NOT EXISTS idx_vg_verse_surface ON verse_glosses(verse_id, surface);
-CREATE INDEX IF NOT EXISTS idx_vg_work_surface ON verse_glosses(work_id, surface);
 CREATE TABLE IF NOT EXISTS tokens (
   token_id INTEGER PRIMARY KEY,
   verse_id INTEGER NOT NULL REFERENCES verses(verse_id) ON DELETE CASCADE,
@@ -190,11 +203,35 @@ CREATE TABLE IF NOT EXISTS tokens (
   pos INTEGER NOT NULL,
   surface TEXT NOT NULL
 );
+CREATE TABLE IF NOT EXISTS verse_wfw (
+  verse_id INTEGER PRIMARY KEY REFERENCES verses(verse_id) ON DELETE CASCADE,
+  work_id INTEGER NOT NULL REFERENCES works(work_id) ON DELETE CASCADE,
+  wfw TEXT NOT NULL,
+  wfw_json TEXT NOT NULL
+);
 CREATE VIRTUAL TABLE IF NOT EXISTS fts_verse_texts USING fts5(
   work_id UNINDEXED, edition_id UNINDEXED, verse_id UNINDEXED,
   kind, language, script, body, content='', tokenize='unicode61 remove_diacritics 2'
 );
-CREATE VIEW IF NOT EXISTS verse_texts_wide AS
+"""
+
+# Kept separate so --fast-build can create them after the data load.
+INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_divisions_work ON divisions(work_id);
+CREATE INDEX IF NOT EXISTS idx_verses_division ON verses(division_id, ordinal);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_editions_uniq ON editions(work_id, kind, language, IFNULL(script,''), IFNULL(translator,''));
+CREATE INDEX IF NOT EXISTS idx_verse_texts_edition ON verse_texts(edition_id);
+CREATE INDEX IF NOT EXISTS idx_tokens_verse ON tokens(verse_id);
+CREATE INDEX IF NOT EXISTS idx_vg_verse_surface ON verse_glosses(verse_id, surface);
+CREATE INDEX IF NOT EXISTS idx_vg_work_surface ON verse_glosses(work_id, surface);
+"""
+
+SCHEMA_SQL = TABLES_SQL + INDEXES_SQL
+
+# verse_texts_wide: one row per verse. By default a table filled by the importer
+# alongside verse_texts (readers skip the pivot); --wide-view keeps the original
+# GROUP BY view. WIDE_PIVOT_SQL is the view body and the backfill query.
+WIDE_PIVOT_SQL = """
 SELECT v.verse_id, v.work_id, v.division_id, v.ref_citation,
   MAX(CASE WHEN e.language='sa' AND e.script='Deva' THEN t.body END) AS sa_deva,
   MAX(CASE WHEN e.language='sa' AND e.script='Latn' THEN t.body END) AS sa_iast,
@@ -202,19 +239,149 @@ SELECT v.verse_id, v.work_id, v.division_id, v.ref_citation,
 FROM verse_texts t
 JOIN verses v ON v.verse_id=t.verse_id
 JOIN editions e ON e.edition_id=t.edition_id
-GROUP BY v.verse_id, v.work_id, v.division_id, v.ref_citation;
+GROUP BY v.verse_id, v.work_id, v.division_id, v.ref_citation
+"""
+
+WIDE_VIEW_SQL = "CREATE VIEW IF NOT EXISTS verse_texts_wide AS" + WIDE_PIVOT_SQL + ";"
+
+WIDE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS verse_texts_wide (
+  verse_id INTEGER PRIMARY KEY REFERENCES verses(verse_id) ON DELETE CASCADE,
+  work_id INTEGER NOT NULL,
+  division_id INTEGER NOT NULL,
+  ref_citation TEXT,
+  sa_deva TEXT,
+  sa_iast TEXT,
+  en_translation TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_vtw_division ON verse_texts_wide(work_id, division_id);
 """
 
-def open_db(db_path: Path, no_reset: bool) -> sqlite3.Connection:
+# --fast-build: no durability during the load (a failed build is simply rerun),
+# FK checks replaced by one foreign_key_check at the end.
+FAST_BUILD_PRAGMAS = (
+    "PRAGMA synchronous = OFF;",
+    "PRAGMA cache_size = -262144;",  # 256 MiB
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA foreign_keys = OFF;",
+)
+
+# verse_wfw: word-by-word per verse, pre-rendered by the importer. wfw is the
+# "surface — gloss; ..." string the search page matches against, wfw_json the
+# [[surface, gloss], ...] pairs the chapter and verse pages list. A surface
+# with several glosses shows the smallest one, which is what the pages'
+# former `(SELECT gloss ... LIMIT 1)` returned through the UNIQUE index.
+WFW_BACKFILL_SQL = """
+INSERT INTO verse_wfw(verse_id, work_id, wfw, wfw_json)
+SELECT t.verse_id, v.work_id,
+  GROUP_CONCAT(t.surface || ' — ' || t.gloss, '; '),
+  json_group_array(json_array(t.surface, t.gloss))
+FROM (SELECT tk.verse_id, tk.surface,
+             COALESCE((SELECT MIN(g.gloss) FROM verse_glosses g
+                       WHERE g.verse_id=tk.verse_id AND g.surface=tk.surface), '') AS gloss
+      FROM tokens tk ORDER BY tk.verse_id, tk.pos) t
+JOIN verses v ON v.verse_id=t.verse_id
+GROUP BY t.verse_id
+"""
+
+def render_wfw(surfaces: List[str], glosses: List[Tuple[str, str]]) -> Tuple[str, str]:
+    first: Dict[str, str] = {}
+    for surface, g in glosses:
+        if surface not in first or g < first[surface]:
+            first[surface] = g
+    pairs = [[surface, first.get(surface, "")] for surface in surfaces]
+    return "; ".join(f"{a} — {b}" for a, b in pairs), json.dumps(pairs, ensure_ascii=False)
+
+def ensure_wide(con: sqlite3.Connection, as_view: bool) -> None:
+    """Create verse_texts_wide as a table or view, converting an existing DB if needed."""
+    row = con.execute("SELECT type FROM sqlite_master WHERE name='verse_texts_wide'").fetchone()
+    want = "view" if as_view else "table"
+    if row and row[0] == want:
+        return
+    if row:
+        con.execute(f"DROP {row[0].upper()} verse_texts_wide")
+    if as_view:
+        con.executescript(WIDE_VIEW_SQL)
+        return
+    con.executescript(WIDE_TABLE_SQL)
+    con.execute("INSERT INTO verse_texts_wide" + WIDE_PIVOT_SQL)
+    con.commit()
+
+def open_db(db_path: Path, no_reset: bool, fast_build: bool = False, wide_view: bool = False) -> sqlite3.Connection:
     if db_path.exists() and not no_reset:
         os.remove(db_path)
-    con = sqlite3.connect(str(db_path))
+    con = sqlite3.connect(str(db_path), factory=ImporterConnection)
     con.execute("PRAGMA foreign_keys = ON;")
-    con.executescript(SCHEMA_SQL)
+    had_wfw = con.execute("SELECT 1 FROM sqlite_master WHERE name='verse_wfw'").fetchone()
+    con.executescript(TABLES_SQL if fast_build else SCHEMA_SQL)
+    if not had_wfw:
+        con.execute(WFW_BACKFILL_SQL)  # DB from before verse_wfw existed
+        con.commit()
+    ensure_wide(con, wide_view)
+    if not fast_build:
+        return con
+    # Rollback still has to work when appending into an existing DB.
+    con.execute("PRAGMA journal_mode = MEMORY;" if no_reset else "PRAGMA journal_mode = OFF;")
+    for pragma in FAST_BUILD_PRAGMAS:
+        con.execute(pragma)
     return con
 
+def finish_fast_build(con: sqlite3.Connection) -> None:
+    """Verify FKs once, then create the postponed indexes and refresh planner stats."""
+    bad = con.execute("PRAGMA foreign_key_check;").fetchall()
+    if bad:
+        raise SystemExit(f"foreign_key_check failed: {len(bad)} violation(s), first: {bad[0]}")
+    con.executescript(INDEXES_SQL)  # commits the load transaction first
+    con.execute("ANALYZE;")
+    con.commit()
+
+# ---------- Lookup caches ----------
+# work_types and editions are tiny, so the first lookup on an ImporterConnection
+# loads both tables (covering --no_reset/--incremental appends) and every later
+# get_or_create_* is a dict hit. Keys mirror idx_editions_uniq (NULL -> '').
+# Whether verse_texts_wide is a table to keep in sync is cached alongside.
+
+class LookupCache:
+    def __init__(self, con: sqlite3.Connection):
+        self.wide_table = wide_is_table(con)
+        self.types = {code for (code,) in con.execute("SELECT code FROM work_types")}
+        self.editions: Dict[Tuple, int] = {}
+        for ed_id, work_id, kind, language, script, translator in con.execute(
+                "SELECT edition_id, work_id, kind, language, script, translator FROM editions"):
+            self.editions[(work_id, kind, language, script or "", translator or "")] = ed_id
+
+    def forget_work(self, work_id: int) -> None:
+        for key in [k for k in self.editions if k[0] == work_id]:
+            del self.editions[key]
+
+def wide_is_table(con: sqlite3.Connection) -> bool:
+    row = con.execute("SELECT type FROM sqlite_master WHERE name='verse_texts_wide'").fetchone()
+    return bool(row) and row[0] == "table"
+
+class ImporterConnection(sqlite3.Connection):
+    """sqlite3 connection carrying the importer's LookupCache."""
+    lookups: Optional[LookupCache] = None
+
+def lookup_cache(cur: sqlite3.Cursor) -> Optional[LookupCache]:
+    con = cur.connection
+    if not isinstance(con, ImporterConnection):
+        return None  # plain connection: fall back to SELECTs
+    if con.lookups is None:
+        con.lookups = LookupCache(con)
+    return con.lookups
+
+def materialize_wide(cur: sqlite3.Cursor) -> bool:
+    cache = lookup_cache(cur)
+    return cache.wide_table if cache is not None else wide_is_table(cur.connection)
+
 def get_or_create_type(cur: sqlite3.Cursor, code: str) -> str:
     code = (code or "").strip() or "Others"
+    cache = lookup_cache(cur)
+    if cache is not None:
+        if code not in cache.types:
+            cur.execute("INSERT INTO work_types(code, label) VALUES (?,?)", (code, code))
+            cache.types.add(code)
+        return code
     cur.execute("SELECT code FROM work_types WHERE code=?", (code,))
     row = cur.fetchone()
     if row:
@@ -223,20 +390,30 @@ def get_or_create_type(cur: sqlite3.Cursor, code: str) -> str:
     return code
 
 def get_or_create_edition(cur: sqlite3.Cursor, work_id: int, kind: str, language: str, script: Optional[str], translator: Optional[str]) -> int:
-    cur.execute("""SELECT edition_id FROM editions
-                   WHERE work_id=? AND kind=? AND language=? AND IFNULL(script,'')=IFNULL(?, '') AND IFNULL(translator,'')=IFNULL(?, '')""",
-                (work_id, kind, language, script, translator))
-    row = cur.fetchone()
-    if row:
-        return row[0]
+    cache = lookup_cache(cur)
+    key = (work_id, kind, language, script or "", translator or "")
+    if cache is not None and key in cache.editions:
+        return cache.editions[key]
+    if cache is None:
+        cur.execute("""SELECT edition_id FROM editions
+                       WHERE work_id=? AND kind=? AND language=? AND IFNULL(script,'')=IFNULL(?, '') AND IFNULL(translator,'')=IFNULL(?, '')""",
+                    (work_id, kind, language, script, translator))
+        row = cur.fetchone()
+        if row:
+            return row[0]
     cur.execute("""INSERT INTO editions(work_id, kind, language, script, translator, is_default)
                    VALUES(?,?,?,?,?,1)""",
                 (work_id, kind, language, script, translator))
+    if cache is not None:
+        cache.editions[key] = cur.lastrowid
     return cur.lastrowid
 
-def import_file(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
+def work_slug(data: Dict[str, Any]) -> str:
+    return data.get("id") or slugify(data.get("title") or "Untitled")
+
+def upsert_work(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
     title = data.get("title") or "Untitled"
-    slug  = data.get("id") or slugify(title)
+    slug  = work_slug(data)
     author= data.get("author")
     type_code = get_or_create_type(cur, data.get("type"))
 
@@ -253,10 +430,18 @@ def import_file(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
                        VALUES (?,?,?,?,?,?,?,?,?)""",
                     (title, None, author, None, slug, type_code, start, end, None))
         work_id = cur.lastrowid
+    return work_id
 
+def default_editions(cur: sqlite3.Cursor, work_id: int) -> Tuple[int, int, int]:
     ed_deva = get_or_create_edition(cur, work_id, "source", "sa", "Deva", None)
     ed_iast = get_or_create_edition(cur, work_id, "source", "sa", "Latn", "IAST")
     ed_en   = get_or_create_edition(cur, work_id, "translation", "en", None, "Unknown")
+    return ed_deva, ed_iast, ed_en
+
+def import_file(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
+    work_id = upsert_work(cur, data)
+    ed_deva, ed_iast, ed_en = default_editions(cur, work_id)
+    wide = materialize_wide(cur)
 
     chapters = data.get("chapters") or []
     for ch in chapters:
@@ -282,19 +467,28 @@ def import_file(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
                 cur.execute("INSERT OR REPLACE INTO verse_texts(verse_id, edition_id, body) VALUES (?,?,?)", (verse_id, ed_iast, iast))
             if en:
                 cur.execute("INSERT OR REPLACE INTO verse_texts(verse_id, edition_id, body) VALUES (?,?,?)", (verse_id, ed_en, en))
+            if wide and (dev or iast or en):
+                cur.execute("""INSERT INTO verse_texts_wide(verse_id, work_id, division_id, ref_citation, sa_deva, sa_iast, en_translation)
+                               VALUES (?,?,?,?,?,?,?)""", (verse_id, work_id, division_id, ref, dev or None, iast or None, en or None))
 
             w2w = v.get("word_by_word") or []
             pos = 1
+            surfaces: List[str] = []; pairs: List[Tuple[str, str]] = []
             for item in w2w:
                 surface = item.get("sanskrit"); gloss = item.get("english")
                 if not surface: 
                     continue
                 cur.execute("INSERT INTO tokens(verse_id, edition_id, pos, surface) VALUES (?,?,?,?)", (verse_id, ed_deva, pos, surface))
                 pos += 1
+                surfaces.append(surface)
                 glist = [g for g in (gloss if isinstance(gloss, list) else [gloss]) if isinstance(g, str) and g and g.strip()] if gloss else []
                 for g in glist:
                     cur.execute("""INSERT OR IGNORE INTO verse_glosses(work_id, verse_id, surface, gloss, source) VALUES (?,?,?,?,?)""",
                                 (work_id, verse_id, surface, g.strip(), "json"))
+                    pairs.append((surface, g.strip()))
+            if surfaces:
+                cur.execute("INSERT INTO verse_wfw(verse_id, work_id, wfw, wfw_json) VALUES (?,?,?,?)",
+                            (verse_id, work_id, *render_wfw(surfaces, pairs)))
 
             for ed_id, txt in ((ed_deva, dev), (ed_iast, iast), (ed_en, en)):
                 if txt:
@@ -304,6 +498,364 @@ def import_file(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
 
     return work_id
 
+# ---------- Bulk ingest ----------
+# A chapter is normalized into plain tuples first, then written with one
+# executemany per table. verse_ids are pre-assigned from MAX(verse_id) so the
+# child rows (texts, tokens, glosses, FTS) never need cur.lastrowid.
+# Row order per table matches import_file, so both paths yield the same DB.
+
+def normalize_verse(v: Dict[str, Any], ch_num: int, n_verses: int) -> Tuple:
+    v_num = int(v.get("number") or (n_verses+1))
+    ref   = v.get("ref") or f"{ch_num}.{v_num}"
+    bodies = (v.get("devanagari"), v.get("iast"), v.get("translation"))
+    surfaces: List[str] = []
+    glosses: List[Tuple[str, str]] = []
+    for item in v.get("word_by_word") or []:
+        surface = item.get("sanskrit"); gloss = item.get("english")
+        if not surface:
+            continue
+        surfaces.append(surface)
+        glist = [g for g in (gloss if isinstance(gloss, list) else [gloss]) if isinstance(g, str) and g and g.strip()] if gloss else []
+        glosses.extend((surface, g.strip()) for g in glist)
+    return (v_num, ref, bodies, surfaces, glosses)
+
+def normalize_chapter(ch: Dict[str, Any], fallback_num: int) -> Tuple:
+    ch_num = int(ch.get("number") or fallback_num)
+    ch_label = ch.get("title") or f"Chapter {ch_num}"
+    verses = ch.get("verses") or []
+    return (ch_num, ch_label, f"chapter-{ch_num}", [normalize_verse(v, ch_num, len(verses)) for v in verses])
+
+def edition_rows(cur: sqlite3.Cursor, edition_ids: Tuple[int, ...]) -> List[Tuple[int, str, str, Optional[str]]]:
+    """(edition_id, kind, language, script) in the order given, for FTS rows."""
+    by_id = {}
+    for ed_id in edition_ids:
+        cur.execute("SELECT edition_id, kind, language, script FROM editions WHERE edition_id=?", (ed_id,))
+        by_id[ed_id] = cur.fetchone()
+    return [by_id[ed_id] for ed_id in edition_ids]
+
+def write_chapter_bulk(cur: sqlite3.Cursor, work_id: int, eds: List[Tuple[int, str, str, Optional[str]]], chapter: Tuple) -> int:
+    ch_num, ch_label, slug_div, verses = chapter
+    cur.execute("""INSERT INTO divisions(work_id, parent_id, level_name, ordinal, label, slug) VALUES (?,?,?,?,?,?)""",
+                (work_id, None, "chapter", ch_num, ch_label, slug_div))
+    division_id = cur.lastrowid
+    cur.execute("SELECT IFNULL(MAX(verse_id), 0) FROM verses")
+    verse_id = cur.fetchone()[0]
+    ed_tokens = eds[0][0]
+
+    verse_rows, text_rows, token_rows, gloss_rows, fts_rows, wide_rows, wfw_rows = [], [], [], [], [], [], []
+    for v_num, ref, bodies, surfaces, glosses in verses:
+        verse_id += 1
+        verse_rows.append((verse_id, work_id, division_id, ref, v_num))
+        if any(bodies):
+            wide_rows.append((verse_id, work_id, division_id, ref, *(b or None for b in bodies)))
+        for (ed_id, kind, language, script), txt in zip(eds, bodies):
+            if txt:
+                text_rows.append((verse_id, ed_id, txt))
+                fts_rows.append((work_id, ed_id, verse_id, kind, language, script, txt))
+        token_rows.extend((verse_id, ed_tokens, pos, surface) for pos, surface in enumerate(surfaces, 1))
+        gloss_rows.extend((work_id, verse_id, surface, g, "json") for surface, g in glosses)
+        if surfaces:
+            wfw_rows.append((verse_id, work_id, *render_wfw(surfaces, glosses)))
+
+    cur.executemany("INSERT INTO verses(verse_id, work_id, division_id, ref_citation, ordinal) VALUES (?,?,?,?,?)", verse_rows)
+    cur.executemany("INSERT OR REPLACE INTO verse_texts(verse_id, edition_id, body) VALUES (?,?,?)", text_rows)
+    cur.executemany("INSERT INTO tokens(verse_id, edition_id, pos, surface) VALUES (?,?,?,?)", token_rows)
+    cur.executemany("""INSERT OR IGNORE INTO verse_glosses(work_id, verse_id, surface, gloss, source) VALUES (?,?,?,?,?)""", gloss_rows)
+    cur.executemany("INSERT INTO verse_wfw(verse_id, work_id, wfw, wfw_json) VALUES (?,?,?,?)", wfw_rows)
+    cur.executemany("""INSERT INTO fts_verse_texts(work_id, edition_id, verse_id, kind, language, script, body)
+                       VALUES (?,?,?,?,?,?,?)""", fts_rows)
+    if materialize_wide(cur):
+        cur.executemany("""INSERT INTO verse_texts_wide(verse_id, work_id, division_id, ref_citation, sa_deva, sa_iast, en_translation)
+                           VALUES (?,?,?,?,?,?,?)""", wide_rows)
+    return len(verse_rows)
+
+def write_work_bulk(cur: sqlite3.Cursor, data: Dict[str, Any], chapters: Iterable[Tuple]) -> Tuple[int, int]:
+    work_id = upsert_work(cur, data)
+    eds = edition_rows(cur, default_editions(cur, work_id))
+    n_verses = 0
+    for chapter in chapters:
+        n_verses += write_chapter_bulk(cur, work_id, eds, chapter)
+    return work_id, n_verses
+
+def import_file_bulk(cur: sqlite3.Cursor, data: Dict[str, Any]) -> int:
+    chapters = data.get("chapters") or []
+    return write_work_bulk(cur, data, (normalize_chapter(ch, len(chapters)+1) for ch in chapters))[0]
+
+def count_verses(data: Dict[str, Any]) -> int:
+    return sum(len(ch.get("verses") or []) for ch in data.get("chapters") or [])
+
+# ---------- Streaming reader ----------
+# Walks the top-level work object with JSONDecoder.raw_decode over a growing
+# text buffer, handing out one chapter dict at a time, so peak memory is one
+# chapter rather than the whole book. Work fields (id, title, type, ...) must
+# precede "chapters", as in every generated JSON. The chapter count is unknown
+# while streaming, so a chapter without "number" falls back to its position.
+
+WORK_KEYS = ("id", "title", "author", "type", "date_of_origin")
+
+class _JsonStream:
+    def __init__(self, f: TextIO, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("unexpected end of JSON stream")
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r} at offset {self.pos}, got {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # Strings, objects, arrays and literals are complete once they
+                # decode. A number cut at the buffer edge decodes early ("1" of
+                # "1.5"), so accept it only once its delimiter is in the buffer.
+                if (self.eof or not isinstance(obj, (int, float)) or isinstance(obj, bool)
+                        or (end < len(self.buf) and self.buf[end] in " \t\r\n,:]}")):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically so a large chapter is re-scanned O(log n) times.
+            self._fill(max(self.chunk_size, len(self.buf) - self.pos))
+
+def _iter_array(js: _JsonStream) -> Iterator[Any]:
+    js.expect("[")
+    if js.peek() == "]":
+        js.pos += 1
+        return
+    while True:
+        yield js.value()
+        if js.peek() == "]":
+            js.pos += 1
+            return
+        js.expect(",")
+
+def open_work_stream(f: TextIO) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Read work fields up to "chapters"; return them with a lazy chapter iterator."""
+    js = _JsonStream(f)
+    js.expect("{")
+    header: Dict[str, Any] = {}
+
+    def keys() -> Iterator[str]:
+        if js.peek() == "}":
+            return
+        while True:
+            key = js.value()
+            js.expect(":")
+            yield key  # caller consumes the value before resuming
+            if js.peek() == "}":
+                return
+            js.expect(",")
+
+    it = keys()
+    for key in it:
+        if key == "chapters":
+            break
+        header[key] = js.value()
+    else:
+        return header, iter(())
+
+    def chapters() -> Iterator[Dict[str, Any]]:
+        if js.peek() == "[":
+            yield from _iter_array(js)
+        else:
+            js.value()  # "chapters": null
+        for key in it:
+            if key in WORK_KEYS:
+                raise ValueError(f"work field {key!r} follows \"chapters\"; import this file without --stream")
+            js.value()
+
+    return header, chapters()
+
+# ---------- Parallel parse, single writer ----------
+# Worker processes json.load + normalize whole files; results come back in file
+# order (so work_ids match a serial run) through a bounded queue that the
+# connection's own thread drains. SQLite only ever sees one writer.
+
+def parse_work(path: str) -> Tuple[Dict[str, Any], List[Tuple]]:
+    """Process-pool task: work header fields plus normalized chapters."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    chapters = data.pop("chapters", None) or []
+    return data, [normalize_chapter(ch, len(chapters)+1) for ch in chapters]
+
+def _feed_parsed(files: List[Path], workers: int, out: "queue.Queue") -> None:
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque = deque()
+            for fp in files:
+                pending.append((fp, pool.submit(parse_work, str(fp))))
+                if len(pending) >= 2 * workers:
+                    fp0, fut = pending.popleft()
+                    out.put((fp0, fut.result()))
+            while pending:
+                fp0, fut = pending.popleft()
+                out.put((fp0, fut.result()))
+    except BaseException as e:
+        out.put(e)
+        return
+    out.put(None)
+
+def iter_parsed_parallel(files: List[Path], workers: int) -> Iterator[Tuple[Path, Dict[str, Any], List[Tuple]]]:
+    parsed: "queue.Queue" = queue.Queue(maxsize=2 * workers)
+    feeder = threading.Thread(target=_feed_parsed, args=(files, workers, parsed), daemon=True)
+    feeder.start()
+    while True:
+        item = parsed.get()
+        if item is None:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        fp, (data, chapters) = item
+        yield fp, data, chapters
+    feeder.join()
+
+def iter_works(files: List[Path], args) -> Iterator[Tuple[Path, Dict[str, Any], Optional[Iterable[Tuple]]]]:
+    """(path, work data, normalized chapters) per file; chapters is None for the
+    row-by-row import_file path, which reads them from data itself."""
+    if args.workers > 0:
+        yield from iter_parsed_parallel(files, args.workers)
+        return
+    for fp in files:
+        with open(fp, "r", encoding="utf-8") as f:
+            if args.stream:
+                data, chapters = open_work_stream(f)
+                yield fp, data, (normalize_chapter(ch, i) for i, ch in enumerate(chapters, 1))
+                continue
+            data = json.load(f)
+        if args.bulk:
+            chapters = data.get("chapters") or []
+            yield fp, data, (normalize_chapter(ch, len(chapters)+1) for ch in chapters)
+        else:
+            yield fp, data, None
+
+# ---------- Incremental rebuild ----------
+# build_state remembers (size, mtime, sha256) and the work_id of every source
+# file. Unchanged files are skipped; a changed file has its work's rows purged
+# and re-imported in the same transaction. The contentless FTS table cannot
+# delete a single work's rows, so it is rebuilt from verse_texts whenever an
+# existing work was replaced or dropped (new works are just appended).
+
+BUILD_STATE_SQL = """
+CREATE TABLE IF NOT EXISTS build_state (
+  path TEXT PRIMARY KEY,
+  work_id INTEGER,
+  size INTEGER NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  sha256 TEXT NOT NULL
+);
+"""
+
+def file_sha256(fp: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(fp, "rb") as f:
+        for b in iter(lambda: f.read(chunk_size), b""):
+            h.update(b)
+    return h.hexdigest()
+
+def changed_source(cur: sqlite3.Cursor, fp: Path) -> Optional[Tuple[str, int, int, str]]:
+    """New (path, size, mtime_ns, sha256) for fp, or None if it is unchanged since the last build."""
+    path = str(fp.resolve())
+    st = fp.stat()
+    cur.execute("SELECT size, mtime_ns, sha256 FROM build_state WHERE path=?", (path,))
+    row = cur.fetchone()
+    if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+        return None
+    digest = file_sha256(fp)
+    if row and row[0] == st.st_size and row[2] == digest:
+        cur.execute("UPDATE build_state SET mtime_ns=? WHERE path=?", (st.st_mtime_ns, path))
+        return None
+    return (path, st.st_size, st.st_mtime_ns, digest)
+
+def purge_work(cur: sqlite3.Cursor, work_id: int, drop_work: bool = False) -> None:
+    """Delete a work's divisions, verses, texts, tokens and glosses (FTS excluded)."""
+    in_work = "verse_id IN (SELECT verse_id FROM verses WHERE work_id=?)"
+    cur.execute(f"DELETE FROM tokens WHERE {in_work}", (work_id,))
+    cur.execute(f"DELETE FROM verse_texts WHERE {in_work}", (work_id,))
+    cur.execute("DELETE FROM verse_glosses WHERE work_id=?", (work_id,))
+    cur.execute("DELETE FROM verse_wfw WHERE work_id=?", (work_id,))
+    if materialize_wide(cur):
+        cur.execute("DELETE FROM verse_texts_wide WHERE work_id=?", (work_id,))
+    cur.execute("DELETE FROM verses WHERE work_id=?", (work_id,))
+    cur.execute("DELETE FROM divisions WHERE work_id=?", (work_id,))
+    if drop_work:
+        cur.execute("DELETE FROM editions WHERE work_id=?", (work_id,))
+        cur.execute("DELETE FROM works WHERE work_id=?", (work_id,))
+        cache = lookup_cache(cur)
+        if cache is not None:
+            cache.forget_work(work_id)
+
+def purge_previous(cur: sqlite3.Cursor, path: str, data: Dict[str, Any]) -> bool:
+    """Clear whatever an earlier import of this file or slug left behind; True if anything was purged."""
+    cur.execute("SELECT work_id FROM works WHERE slug=?", (work_slug(data),))
+    row = cur.fetchone()
+    current = row[0] if row else None
+    cur.execute("SELECT work_id FROM build_state WHERE path=?", (path,))
+    row = cur.fetchone()
+    previous = row[0] if row else None
+    if previous is not None and previous != current:
+        purge_work(cur, previous, drop_work=True)  # the file's slug changed
+    if current is not None:
+        purge_work(cur, current)
+    return current is not None or previous is not None
+
+def purge_removed(cur: sqlite3.Cursor) -> bool:
+    """Drop works whose recorded source file no longer exists; True if any were dropped."""
+    cur.execute("SELECT path, work_id FROM build_state")
+    dropped = False
+    for path, work_id in cur.fetchall():
+        if Path(path).exists():
+            continue
+        cur.execute("DELETE FROM build_state WHERE path=?", (path,))
+        # Another file may have taken over the slug (and so the work_id)
+        cur.execute("SELECT 1 FROM build_state WHERE work_id=?", (work_id,))
+        if work_id is not None and cur.fetchone() is None:
+            purge_work(cur, work_id, drop_work=True)
+            dropped = True
+        print(f"Source removed, dropped work_id={work_id} from {path}")
+    return dropped
+
+def record_source(cur: sqlite3.Cursor, src: Tuple[str, int, int, str], work_id: int) -> None:
+    path, size, mtime_ns, digest = src
+    cur.execute("""INSERT OR REPLACE INTO build_state(path, work_id, size, mtime_ns, sha256) VALUES (?,?,?,?,?)""",
+                (path, work_id, size, mtime_ns, digest))
+
+def rebuild_fts(cur: sqlite3.Cursor) -> None:
+    cur.execute("INSERT INTO fts_verse_texts(fts_verse_texts) VALUES('delete-all')")
+    cur.execute("""INSERT INTO fts_verse_texts(work_id, edition_id, verse_id, kind, language, script, body)
+                   SELECT v.work_id, e.edition_id, v.verse_id, e.kind, e.language, e.script, t.body
+                   FROM verse_texts t
+                   JOIN verses v ON v.verse_id=t.verse_id
+                   JOIN editions e ON e.edition_id=t.edition_id
+                   ORDER BY t.verse_id, t.edition_id""")
+
 def main(argv=None):
     args = parse_args(argv)
     db_path = Path(args.db)
@@ -313,21 +865,48 @@ def main(argv=None):
         files += [Path(p) for p in glob.glob(str(Path(args.indir) / args.pattern))]
     files = [f for f in files if f.exists() and f.suffix.lower()==".json"]
 
-    if db_path.exists() and not args.no_reset:
-        os.remove(db_path)
-    con = sqlite3.connect(str(db_path))
-    con.execute("PRAGMA foreign_keys = ON;")
-    con.executescript(SCHEMA_SQL)
+    con = open_db(db_path, args.no_reset or args.incremental, args.fast_build, args.wide_view)
     cur = con.cursor()
 
-    for fp in files:
-        with open(fp, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        wid = import_file(cur, data)
-        con.commit()
+    sources: Dict[Path, Tuple[str, int, int, str]] = {}
+    if args.incremental:
+        con.executescript(BUILD_STATE_SQL)
+        for fp in files:
+            src = changed_source(cur, fp)
+            if src is None:
+                print(f"Unchanged, skipped {fp}")
+            else:
+                sources[fp] = src
+        files = [fp for fp in files if fp in sources]
+    # Incremental and fast builds commit once, so a failed run leaves the DB as it was.
+    commit_each = not (args.fast_build or args.incremental)
+
+    n_verses = 0
+    replaced = purge_removed(cur) if args.incremental else False
+    t0 = time.perf_counter()
+    for fp, data, chapters in iter_works(files, args):
+        if args.incremental:
+            replaced |= purge_previous(cur, sources[fp][0], data)
+        if chapters is None:
+            wid, n = import_file(cur, data), count_verses(data)
+        else:
+            wid, n = write_work_bulk(cur, data, chapters)
+        if args.incremental:
+            record_source(cur, sources[fp], wid)
+        if commit_each:
+            con.commit()
+        n_verses += n
         print(f"Imported {data.get('title')} (work_id={wid}) from {fp}")
+    if replaced:
+        rebuild_fts(cur)
+    if args.fast_build:
+        finish_fast_build(con)
+    else:
+        con.commit()
+    elapsed = time.perf_counter() - t0
 
     con.close()
+    print(f"Ingested {n_verses} verses in {elapsed:.2f}s ({n_verses / elapsed if elapsed else 0:.0f} verses/sec)")
     print(f"Done. SQLite DB at: {db_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Append masked mean pooling and L2 normalization to the ONNX encoder.
+
+Reads onnx_model/model.onnx, whose first output is the hidden states
+[B,S,H], and writes onnx_model/model_pooled.onnx whose only output is
+sentence_embedding [B,H]:
+
+    mean = sum_t(h_t * m_t) / max(sum_t(m_t), 1e-9)
+    out  = mean / (||mean||_2 + 1e-12)
+
+the same arithmetic encode_semantic.Encoder.encode_ids() does in NumPy, so
+ORT hands back finished vectors (B*H floats instead of B*S*H) and there is
+no post-processing left in the encode loop. Use it with
+`encode_semantic.py --model pooled`. Needs the `onnx` package.
+
+The pooled model is a build artifact: the browser encodes queries with
+transformers.js, so it is gitignored and not listed in manifest.json.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+ONNX_DIR = HERE.parent / "assets" / "data" / "semantic" / "onnx_model"
+OUTPUT_NAME = "sentence_embedding"
+MASK_NAMES = ("attention_mask", "attn_mask", "mask")
+
+
+def add_pooling(model, prefix: str = "pool/"):
+    """Return `model` with its outputs replaced by the pooled, unit-norm [B,H] embedding."""
+    from onnx import TensorProto, helper, numpy_helper
+
+    graph = model.graph
+    opset = next((o.version for o in model.opset_import if o.domain in ("", "ai.onnx")), 0)
+    mask = next((i.name for i in graph.input if i.name in MASK_NAMES), None)
+    if mask is None:
+        raise SystemExit(f"No attention mask input in model; inputs: {[i.name for i in graph.input]}")
+    if not graph.output:
+        raise SystemExit("Model has no outputs")
+    hidden = graph.output[0]
+    dims = hidden.type.tensor_type.shape.dim
+    if len(dims) != 3:
+        raise SystemExit(f"First output {hidden.name!r} is not [B,S,H] hidden states")
+
+    nodes, inits = [], []
+
+    def name(n: str) -> str:
+        return prefix + n
+
+    def const(n: str, value) -> str:
+        inits.append(numpy_helper.from_array(np.asarray(value), name(n)))
+        return name(n)
+
+    def node(op: str, inputs: list[str], out: str, **attrs) -> str:
+        nodes.append(helper.make_node(op, inputs, [name(out)], name=name(out), **attrs))
+        return name(out)
+
+    # Opset 13 moved `axes` of ReduceSum/Unsqueeze from an attribute to an input
+    def reduce_sum(x: str, axis: int, keepdims: int, out: str) -> str:
+        if opset >= 13:
+            return node("ReduceSum", [x, const(out + "_axes", np.array([axis], dtype=np.int64))], out,
+                        keepdims=keepdims)
+        return node("ReduceSum", [x], out, axes=[axis], keepdims=keepdims)
+
+    def unsqueeze(x: str, axis: int, out: str) -> str:
+        if opset >= 13:
+            return node("Unsqueeze", [x, const(out + "_axes", np.array([axis], dtype=np.int64))], out)
+        return node("Unsqueeze", [x], out, axes=[axis])
+
+    m = node("Cast", [mask], "mask_f", to=TensorProto.FLOAT)                       # [B,S]
+    m = unsqueeze(m, 2, "mask_e")                                                  # [B,S,1]
+    summed = reduce_sum(node("Mul", [hidden.name, m], "masked"), 1, 0, "summed")   # [B,H]
+    count = reduce_sum(m, 1, 0, "count")                                           # [B,1]
+    count = node("Max", [count, const("eps_count", np.float32(1e-9))], "count_c")
+    mean = node("Div", [summed, count], "mean")                                    # [B,H]
+    sq = reduce_sum(node("Mul", [mean, mean], "sq"), 1, 1, "sumsq")                # [B,1]
+    norm = node("Add", [node("Sqrt", [sq], "norm"), const("eps_norm", np.float32(1e-12))], "norm_e")
+    nodes.append(helper.make_node("Div", [mean, norm], [OUTPUT_NAME], name=name("normalize")))
+
+    batch, _, width = dims
+    out = helper.make_tensor_value_info(OUTPUT_NAME, TensorProto.FLOAT, [
+        d.dim_param or d.dim_value or None for d in (batch, width)
+    ])
+    graph.node.extend(nodes)
+    graph.initializer.extend(inits)
+    del graph.output[:]
+    graph.output.append(out)
+    return model
+
+
+def is_current(src: Path, dest: Path) -> bool:
+    """True if dest exists and is at least as new as src."""
+    return dest.is_file() and src.is_file() and dest.stat().st_mtime >= src.stat().st_mtime
+
+
+def build_pooled(src: Path, dest: Path) -> None:
+    try:
+        import onnx
+    except ImportError:
+        raise SystemExit("build_pooled_model.py needs the onnx package (pip install onnx)")
+    if not src.is_file():
+        raise SystemExit(f"ONNX model not found: {src}")
+    model = add_pooling(onnx.load(str(src)))
+    onnx.checker.check_model(model)
+    tmp = dest.with_name(dest.name + ".tmp")
+    onnx.save(model, str(tmp))
+    tmp.replace(dest)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Write model_pooled.onnx: the encoder with pooling + L2 norm in the graph")
+    p.add_argument("--model", default=str(ONNX_DIR / "model.onnx"),
+                   help="Source encoder (default: assets/data/semantic/onnx_model/model.onnx)")
+    p.add_argument("--out", default=str(ONNX_DIR / "model_pooled.onnx"),
+                   help="Output model (default: assets/data/semantic/onnx_model/model_pooled.onnx)")
+    p.add_argument("--force", action="store_true", help="Rebuild even if the output is newer than the source")
+    return p.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    src, dest = Path(args.model), Path(args.out)
+    if not args.force and is_current(src, dest):
+        print(f"{dest} is newer than {src}; skipping (--force to rebuild)")
+        return
+    build_pooled(src, dest)
+    print(f"Wrote {dest} ({OUTPUT_NAME} [B,H] output)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
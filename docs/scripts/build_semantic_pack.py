@@ -3,31 +3,74 @@
 
 This script creates a compact SQLite database containing:
   - passages: verse metadata + flattened text
-  - embeddings: per-verse Float32 vectors (stored as BLOB)
-  - meta: dense metadata (dimension, algorithm, timestamp)
+  - embeddings: per-verse vector BLOBs, the staging table while building;
+    empty in a finished pack
+  - embedding_matrix: the vectors, in id order, as one blob of up to
+    --matrix-chunk concatenated rows per chunk (uint32 id array alongside),
+    so readers load the whole index in a few reads; f32 rows can be viewed
+    as an [N, dim] array as-is
+  - meta: dense metadata (dimension, algorithm, vector format, timestamp)
 
 The embedding algorithm is intentionally simple and deterministic so the
 front-end can reproduce query vectors without large ML models.  It mixes
 word frequency with character n-grams using a 64-bit FNV-1a hash and L2
 normalisation.
+
+With NumPy installed, verses are embedded in batches: every feature of the
+batch is hashed at once (uint64 FNV-1a over equal-length groups) and summed
+into a [batch, dim] matrix with bincount.  Feature weights are multiples of
+0.25, so the float64 sums and norms are exact and the vectors are
+bit-identical to `embed_text`, which stays as the reference path.
+
+Both paths memoize each token's (bucket, weight) features in a bounded LRU
+(`FeatureCache`), since corpus words repeat heavily; the hit rate is printed
+at the end of the build.
+
+Verses are read from the source with fetchmany, one --batch at a time, and
+each batch is embedded and written before the next is fetched, so memory
+stays flat as the corpus grows.  `--workers N` embeds these batches in a
+process pool (one cache per worker, at most 2*N in flight); the parent
+writes each with executemany in verse_id order, so the output matches the
+serial build.
+
+`--storage` picks the vector blob layout, recorded in meta.vector_format:
+  - f32: dim little-endian float32 (default),
+  - f16: dim float16,
+  - int8: a float32 scale (max|v|/127) then dim int8, v ~= q * scale,
+  - sparse-u16-f16: the non-zero entries only, n uint16 indices followed by
+    n float16 values (4 bytes per non-zero instead of 4*dim).
+`unpack_vector` expands any of them back to dense float32; encode_semantic.py
+uses the same helpers for its --format option.
 """
 from __future__ import annotations
 
 import argparse
 import datetime as _dt
 import hashlib
+import itertools
 import math
 import os
+import re
 import sqlite3
 import struct
 import sys
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback via embed_text
+    np = None
 
 FNV_OFFSET = 0xcbf29ce484222325
 FNV_PRIME = 0x100000001b3
 MASK64 = 0xFFFFFFFFFFFFFFFF
 
+# meta.vector_format values
+VECTOR_FORMATS = ("f32", "f16", "int8", "sparse-u16-f16")
+
 
 def fnv1a64(data: bytes) -> int:
     h = FNV_OFFSET
@@ -37,6 +80,10 @@ def fnv1a64(data: bytes) -> int:
     return h
 
 
+# Same tokens as tokenize(): runs of str.isalnum() characters.
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
 def tokenize(text: str) -> Iterable[str]:
     token = []
     for ch in text.lower():
@@ -67,23 +114,352 @@ def add_features(vec: list[float], token: str, dim: int) -> None:
             vec[h3] += 0.25
 
 
-def embed_text(texts: Sequence[str], dim: int) -> bytes:
+class FeatureCache:
+    """Bounded LRU from token to its (buckets, weights) features for one dim."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, token: str) -> Any:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry
+
+    def put(self, token: str, entry: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[token] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def cache_summary(hits: int, misses: int) -> str:
+    total = hits + misses
+    rate = 100.0 * hits / total if total else 0.0
+    return f"Feature cache: {hits}/{total} token lookups hit ({rate:.1f}%)"
+
+
+def token_entry(token: str, dim: int) -> tuple[tuple[int, ...], tuple[float, ...]]:
+    """add_features for one token as parallel (buckets, weights) tuples."""
+    acc: defaultdict[int, float] = defaultdict(float)
+    add_features(acc, token, dim)  # type: ignore[arg-type]
+    return tuple(acc), tuple(acc.values())
+
+
+def embed_text(texts: Sequence[str], dim: int, cache: Optional[FeatureCache] = None) -> bytes:
     vec = [0.0] * dim
     for raw in texts:
         if not raw:
             continue
         for token in tokenize(raw):
-            add_features(vec, token, dim)
+            if cache is None:
+                add_features(vec, token, dim)
+                continue
+            entry = cache.get(token)
+            if entry is None:
+                entry = token_entry(token, dim)
+                cache.put(token, entry)
+            for h, w in zip(*entry):
+                vec[h] += w
     norm = math.sqrt(sum(v * v for v in vec))
     if norm:
         vec = [v / norm for v in vec]
     return struct.pack("<%df" % dim, *vec)
 
 
-def gather_rows(con: sqlite3.Connection) -> list[dict]:
+def fnv1a64_many(blobs: Sequence[bytes]) -> "np.ndarray":
+    """fnv1a64 over many byte strings; strings of equal length are hashed column by column."""
+    lengths = np.fromiter(map(len, blobs), dtype=np.int64, count=len(blobs))
+    order = np.argsort(lengths, kind="stable")
+    data = np.frombuffer(b"".join([blobs[i] for i in order.tolist()]), dtype=np.uint8)
+    sorted_lengths = lengths[order]
+    out = np.empty(len(blobs), dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    lo, offset = 0, 0
+    for n, count in zip(*np.unique(sorted_lengths, return_counts=True)):
+        n, count = int(n), int(count)
+        group = data[offset : offset + n * count].reshape(count, n)
+        h = np.full(count, FNV_OFFSET, dtype=np.uint64)
+        for col in np.ascontiguousarray(group.T):
+            h ^= col
+            h *= prime  # wraps mod 2**64
+        out[order[lo : lo + count]] = h
+        lo += count
+        offset += n * count
+    return out
+
+
+def hash_tokens(tokens: Sequence[str], dim: int) -> list[tuple["np.ndarray", "np.ndarray"]]:
+    """(buckets, weights) arrays per token, the same features as add_features, hashed in one pass."""
+    if not tokens:
+        return []
+    features: list[str] = []
+    weights: list[float] = []
+    counts: list[int] = []
+    for token in tokens:
+        n = len(token)
+        features.append(token)
+        weights.append(1.0)
+        if n >= 4:
+            features += ["bg:" + token[i : i + 2] for i in range(n - 1)]
+            weights += [0.5] * (n - 1)
+        if n >= 6:
+            features += ["cg:" + token[i : i + 4] for i in range(n - 3)]
+            weights += [0.25] * (n - 3)
+        counts.append(1 + (n - 1 if n >= 4 else 0) + (n - 3 if n >= 6 else 0))
+    # Tokens are alphanumeric, so "\n" can separate them for a single encode.
+    blobs = "\n".join(features).encode("utf-8").split(b"\n")
+    buckets = (fnv1a64_many(blobs) % np.uint64(dim)).astype(np.int64)
+    ends = np.cumsum(counts)[:-1]
+    return list(zip(np.split(buckets, ends), np.split(np.asarray(weights), ends)))
+
+
+def embed_batch(batch: Sequence[Sequence[str]], dim: int, cache: Optional[FeatureCache] = None) -> "np.ndarray":
+    """embed_text for many verses at once; returns a [len(batch), dim] little-endian float32 matrix."""
+    tokens: list[str] = []
+    owners: list[int] = []
+    for row, texts in enumerate(batch):
+        for raw in texts:
+            if raw:
+                found = TOKEN_RE.findall(raw.lower())
+                tokens += found
+                owners += [row] * len(found)
+
+    # Look each distinct token up once; only the misses are hashed.
+    cache = cache if cache is not None else FeatureCache(0)
+    entries = dict.fromkeys(tokens)
+    missing = []
+    for token in entries:
+        entries[token] = cache.get(token)
+        if entries[token] is None:
+            missing.append(token)
+    for token, entry in zip(missing, hash_tokens(missing, dim)):
+        entries[token] = entry
+        cache.put(token, entry)
+    cache.hits += len(tokens) - len(entries)  # repeats within the batch
+
+    acc = np.zeros(len(batch) * dim, dtype=np.float64)
+    if tokens:
+        parts = [entries[t] for t in tokens]
+        counts = np.fromiter((len(b) for b, _ in parts), dtype=np.int64, count=len(parts))
+        flat = np.repeat(np.asarray(owners, dtype=np.int64) * dim, counts)
+        flat += np.concatenate([b for b, _ in parts])
+        acc += np.bincount(flat, weights=np.concatenate([w for _, w in parts]), minlength=acc.size)
+    acc = acc.reshape(len(batch), dim)
+    norms = np.sqrt((acc * acc).sum(axis=1))
+    np.divide(acc, norms[:, None], out=acc, where=norms[:, None] != 0)
+    return acc.astype("<f4")
+
+
+def embed_rows(rows: Sequence[dict], dim: int, batch_size: int, cache: Optional[FeatureCache] = None) -> Iterator[bytes]:
+    """Vector blobs for rows in order, batched when NumPy is available."""
+    texts = [[row.get("en_translation"), row.get("sa_iast"), row.get("sa_deva")] for row in rows]
+    if np is None:
+        for t in texts:
+            yield embed_text(t, dim, cache)
+        return
+    for start in range(0, len(texts), batch_size):
+        for vec in embed_batch(texts[start : start + batch_size], dim, cache):
+            yield vec.tobytes()
+
+
+def pack_vector(blob: bytes, fmt: str) -> bytes:
+    """Stored form of a dense little-endian float32 vector blob."""
+    if fmt == "f32":
+        return blob
+    if fmt == "int8":
+        return quantize_int8(blob)
+    if np is not None:
+        vec = np.frombuffer(blob, dtype="<f4")
+        if fmt == "f16":
+            return vec.astype("<f2").tobytes()
+        idx = np.flatnonzero(vec)
+        return idx.astype("<u2").tobytes() + vec[idx].astype("<f2").tobytes()
+    vals = struct.unpack("<%df" % (len(blob) // 4), blob)
+    if fmt == "f16":
+        return struct.pack("<%de" % len(vals), *vals)
+    idx = [i for i, v in enumerate(vals) if v != 0.0]
+    return struct.pack("<%dH" % len(idx), *idx) + struct.pack("<%de" % len(idx), *(vals[i] for i in idx))
+
+
+def quantize_int8(blob: bytes) -> bytes:
+    """float32 scale (max|v|/127) followed by round(v/scale) as int8."""
+    vals = struct.unpack("<%df" % (len(blob) // 4), blob)
+    scale = struct.unpack("<f", struct.pack("<f", max(map(abs, vals), default=0.0) / 127.0))[0]
+    if not scale:
+        return struct.pack("<f", 0.0) + bytes(len(vals))
+    if np is not None:
+        q = np.rint(np.frombuffer(blob, dtype="<f4").astype(np.float64) / scale)
+        return struct.pack("<f", scale) + np.clip(q, -127, 127).astype(np.int8).tobytes()
+    q = [max(-127, min(127, round(v / scale))) for v in vals]
+    return struct.pack("<f%db" % len(q), scale, *q)
+
+
+def unpack_vector(blob: bytes, dim: int, fmt: str) -> bytes:
+    """Dense little-endian float32 blob for a stored vector of the given meta.vector_format."""
+    if fmt == "f32":
+        return bytes(blob)
+    if fmt not in VECTOR_FORMATS:
+        raise ValueError(f"Unknown vector format: {fmt}")
+    if np is not None:
+        if fmt == "f16":
+            return np.frombuffer(blob, dtype="<f2").astype("<f4").tobytes()
+        if fmt == "int8":
+            scale = np.frombuffer(blob, dtype="<f4", count=1)[0]
+            return (np.frombuffer(blob, dtype=np.int8, offset=4).astype("<f4") * scale).tobytes()
+        n = len(blob) // 4
+        out = np.zeros(dim, dtype="<f4")
+        out[np.frombuffer(blob, dtype="<u2", count=n)] = np.frombuffer(blob, dtype="<f2", offset=2 * n)
+        return out.tobytes()
+    if fmt == "f16":
+        return struct.pack("<%df" % dim, *struct.unpack("<%de" % dim, blob))
+    if fmt == "int8":
+        scale, *q = struct.unpack("<f%db" % dim, blob)
+        return struct.pack("<%df" % dim, *(v * scale for v in q))
+    n = len(blob) // 4
+    vec = [0.0] * dim
+    for i, v in zip(struct.unpack_from("<%dH" % n, blob), struct.unpack_from("<%de" % n, blob, 2 * n)):
+        vec[i] = v
+    return struct.pack("<%df" % dim, *vec)
+
+
+MATRIX_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_matrix (
+  chunk INTEGER PRIMARY KEY,   -- 0, 1, ... in id order
+  n_rows INTEGER NOT NULL,
+  ids BLOB NOT NULL,           -- n_rows little-endian uint32
+  offsets BLOB,                -- n_rows + 1 little-endian uint32 row starts in vectors; NULL for fixed-size rows
+  vectors BLOB NOT NULL        -- the n_rows stored vectors (meta.vector_format), concatenated
+);
+"""
+
+
+def vector_format(con: sqlite3.Connection) -> str:
+    row = con.execute("SELECT value FROM meta WHERE key='vector_format'").fetchone()
+    return row[0] if row else "f32"
+
+
+def vector_size(fmt: str, dim: int) -> Optional[int]:
+    """Bytes per stored vector, or None for the variable-length sparse format."""
+    return {"f32": 4 * dim, "f16": 2 * dim, "int8": 4 + dim}.get(fmt)
+
+
+def iter_stored_vectors(con: sqlite3.Connection) -> Iterator[tuple[int, bytes]]:
+    """(id, stored vector blob) in id order: the embeddings rows if any (mid-build or an older pack), else embedding_matrix."""
+    if con.execute("SELECT 1 FROM embeddings LIMIT 1").fetchone():
+        for pid, blob in con.execute("SELECT id, vector FROM embeddings ORDER BY id"):
+            yield pid, bytes(blob)
+        return
+    for n_rows, ids, offsets, vectors in con.execute(
+        "SELECT n_rows, ids, offsets, vectors FROM embedding_matrix ORDER BY chunk"
+    ):
+        if offsets is not None:
+            starts = struct.unpack("<%dI" % (n_rows + 1), offsets)
+        else:  # fixed-size rows
+            size = len(vectors) // n_rows
+            starts = range(0, (n_rows + 1) * size, size)
+        for k, pid in enumerate(struct.unpack("<%dI" % n_rows, ids)):
+            yield pid, bytes(vectors[starts[k]:starts[k + 1]])
+
+
+def iter_matrix_chunks(con: sqlite3.Connection, dim: int, chunk_rows: int = 8192) -> Iterator[tuple[bytes, bytes]]:
+    """(uint32 ids, unit-norm float32 rows) blobs of the stored vectors, in id order."""
+    fmt = vector_format(con)
+    rows = iter_stored_vectors(con)
+    while True:
+        batch = list(itertools.islice(rows, chunk_rows))
+        if not batch:
+            break
+        vectors = b"".join(unpack_vector(blob, dim, fmt) for _, blob in batch)
+        if fmt != "f32":  # decoded quantized rows are only approximately unit length
+            vectors = unit_rows(vectors, dim)
+        yield struct.pack("<%dI" % len(batch), *(r[0] for r in batch)), vectors
+
+
+def write_matrix(con: sqlite3.Connection, dim: int, chunk_rows: int = 8192) -> int:
+    """
+    Move the embeddings rows into embedding_matrix; returns the row count.
+
+    Chunks keep the rows' meta.vector_format bytes unchanged, and the
+    embeddings table is emptied so the pack carries each vector once.
+    With no staged rows an existing matrix is left as it is. Commits, then
+    VACUUMs so the emptied staging pages are not shipped.
+    """
+    if not con.execute("SELECT 1 FROM embeddings LIMIT 1").fetchone():
+        row = con.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='embedding_matrix'"
+        ).fetchone()
+        if row:
+            return con.execute("SELECT COALESCE(SUM(n_rows), 0) FROM embedding_matrix").fetchone()[0]
+    fmt = vector_format(con)
+    con.execute("DROP TABLE IF EXISTS embedding_matrix")
+    con.executescript(MATRIX_SQL)
+    cur = con.cursor()
+    cur.execute("SELECT id, vector FROM embeddings ORDER BY id")
+    total = 0
+    for chunk in itertools.count():
+        rows = cur.fetchmany(chunk_rows)
+        if not rows:
+            break
+        blobs = [bytes(blob) for _, blob in rows]
+        vectors = b"".join(blobs)
+        offsets = None
+        if vector_size(fmt, dim) is None:
+            offsets = struct.pack("<%dI" % (len(blobs) + 1), *itertools.accumulate([0] + [len(b) for b in blobs]))
+        con.execute(
+            "INSERT INTO embedding_matrix(chunk, n_rows, ids, offsets, vectors) VALUES (?,?,?,?,?)",
+            (chunk, len(rows), struct.pack("<%dI" % len(rows), *(r[0] for r in rows)), offsets, vectors),
+        )
+        total += len(rows)
+    con.execute("DELETE FROM embeddings")
+    con.commit()
+    con.execute("VACUUM")  # needs no open transaction
+    return total
+
+
+def unit_rows(vectors: bytes, dim: int) -> bytes:
+    """L2-normalise each row of a row-major little-endian float32 matrix blob."""
+    if np is not None:
+        m = np.frombuffer(vectors, dtype="<f4").reshape(-1, dim)
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        return np.divide(m, norms, out=m.copy(), where=norms != 0).astype("<f4").tobytes()
+    out = []
+    for r in range(len(vectors) // (4 * dim)):
+        vals = struct.unpack_from("<%df" % dim, vectors, 4 * dim * r)
+        norm = math.sqrt(sum(v * v for v in vals)) or 1.0
+        out.append(struct.pack("<%df" % dim, *(v / norm for v in vals)))
+    return b"".join(out)
+
+
+def recall_at_k(base: "np.ndarray", approx: "np.ndarray", k: int = 10, queries: int = 200) -> float:
+    """Mean overlap of top-k dot-product neighbours, float32 rows vs their stored (decoded) form.
+
+    Queries are evenly spaced float32 rows of `base`, as a float32 query vector
+    would be scanned against the stored matrix.
+    """
+    n = len(base)
+    if not n:
+        return 1.0
+    k = min(k, n)
+    picks = np.unique(np.linspace(0, n - 1, num=min(queries, n)).astype(np.int64))
+    q = base[picks]
+    truth = np.argpartition(-(q @ base.T), k - 1, axis=1)[:, :k]
+    found = np.argpartition(-(q @ approx.T), k - 1, axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(truth.tolist(), found.tolist())]))
+
+
+def gather_rows(con: sqlite3.Connection, batch_size: int = 512) -> Iterator[list[dict]]:
+    """Verse rows in verse_id order, fetched and yielded batch_size at a time."""
     con.row_factory = sqlite3.Row
     cur = con.cursor()
-    rows = cur.execute(
+    cur.execute(
         """
         SELECT v.verse_id, v.work_id, v.division_id, v.ordinal AS verse_ord,
                d.ordinal AS chapter_ord,
@@ -95,22 +471,90 @@ def gather_rows(con: sqlite3.Connection) -> list[dict]:
         JOIN verse_texts_wide w ON w.verse_id = v.verse_id
         ORDER BY v.verse_id
         """
-    ).fetchall()
-    return [dict(r) for r in rows]
+    )
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        yield [dict(r) for r in rows]
+
+
+def passage_row(row: dict) -> tuple:
+    text_parts = [row.get("en_translation"), row.get("sa_iast"), row.get("sa_deva")]
+    combined = "\n".join(part.strip() for part in text_parts if part and part.strip())
+    return (
+        int(row["verse_id"]),
+        int(row["work_id"]),
+        int(row["division_id"]),
+        int(row.get("chapter_ord") or 0),
+        int(row.get("verse_ord") or 0),
+        int(row.get("verse_ord") or 0),
+        combined,
+    )
+
+
+_shard_cache: Optional[FeatureCache] = None
+
+
+def _init_shard_worker(cache_size: int) -> None:
+    global _shard_cache
+    _shard_cache = FeatureCache(cache_size)
+
 
+def embed_shard(job: tuple[list[dict], int, int, str]) -> tuple[list[tuple], list[tuple], int, int]:
+    """Pool task: passage rows and (id, vector) rows for one shard, plus its cache hits/misses."""
+    rows, dim, batch_size, fmt = job
+    cache = _shard_cache
+    hits, misses = cache.hits, cache.misses
+    passages = [passage_row(r) for r in rows]
+    vectors = [(p[0], pack_vector(blob, fmt)) for p, blob in zip(passages, embed_rows(rows, dim, batch_size, cache))]
+    return passages, vectors, cache.hits - hits, cache.misses - misses
 
-def build_semantic_db(source: Path, out: Path, dim: int) -> None:
+
+def embed_shards(
+    shards: Iterable[list[dict]], dim: int, batch_size: int, cache_size: int, workers: int, fmt: str = "f32"
+) -> Iterator[tuple[list[tuple], list[tuple], int, int]]:
+    """embed_shard over shards, in order; with workers > 1 at most 2*workers shards are in flight."""
+    if workers <= 1:
+        _init_shard_worker(cache_size)
+        for rows in shards:
+            yield embed_shard((rows, dim, batch_size, fmt))
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker, initargs=(cache_size,)) as pool:
+        pending: deque = deque()
+        for rows in shards:
+            pending.append(pool.submit(embed_shard, (rows, dim, batch_size, fmt)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def build_semantic_db(
+    source: Path,
+    out: Path,
+    dim: int,
+    batch_size: int = 512,
+    cache_size: int = 200_000,
+    workers: int = 1,
+    storage: str = "f32",
+    matrix_chunk: int = 8192,
+) -> None:
     if not source.exists():
         raise SystemExit(f"Source SQLite not found: {source}")
+    if storage not in VECTOR_FORMATS:
+        raise SystemExit(f"Unknown storage format: {storage}")
+    if storage == "sparse-u16-f16" and dim > 1 << 16:
+        raise SystemExit("sparse-u16-f16 storage needs dim <= 65536")
     out.parent.mkdir(parents=True, exist_ok=True)
     if out.exists():
         out.unlink()
 
     src = sqlite3.connect(str(source))
-    rows = gather_rows(src)
-    src.close()
-
-    if not rows:
+    batches = gather_rows(src, batch_size)
+    first = next(batches, None)
+    if first is None:
+        src.close()
         raise SystemExit("No verses found in source database")
 
     dest = sqlite3.connect(str(out))
@@ -143,39 +587,33 @@ def build_semantic_db(source: Path, out: Path, dim: int) -> None:
         [
             ("dim", str(dim)),
             ("algorithm", "hashed-fnv1a64"),
+            ("vector_format", storage),
             ("built_at", ts),
             ("source", str(source)),
         ],
     )
 
-    for row in rows:
-        verse_id = int(row["verse_id"])
-        text_parts = [row.get("en_translation"), row.get("sa_iast"), row.get("sa_deva")]
-        combined = "\n".join(part.strip() for part in text_parts if part and part.strip())
-        if not combined:
-            combined = ""
-        vec_blob = embed_text(text_parts, dim)
-        cur.execute(
+    n_rows = hits = misses = 0
+    shards = itertools.chain([first], batches)
+    for passages, vectors, shard_hits, shard_misses in embed_shards(shards, dim, batch_size, cache_size, workers, storage):
+        cur.executemany(
             "INSERT INTO passages(id, work_id, division_id, chapter, verse_start, verse_end, text)"
             " VALUES (?,?,?,?,?,?,?)",
-            (
-                verse_id,
-                int(row["work_id"]),
-                int(row["division_id"]),
-                int(row.get("chapter_ord") or 0),
-                int(row.get("verse_ord") or 0),
-                int(row.get("verse_ord") or 0),
-                combined,
-            ),
-        )
-        cur.execute(
-            "INSERT INTO embeddings(id, vector) VALUES (?, ?)",
-            (verse_id, sqlite3.Binary(vec_blob)),
+            passages,
         )
+        cur.executemany("INSERT INTO embeddings(id, vector) VALUES (?, ?)", vectors)
+        n_rows += len(passages)
+        hits += shard_hits
+        misses += shard_misses
 
     dest.commit()
+    dest.execute("PRAGMA journal_mode = DELETE;")  # single-file pack for the browser
+    write_matrix(dest, dim, matrix_chunk)
     dest.close()
-    print(f"Semantic DB written to {out} (rows={len(rows)}, dim={dim})")
+    src.close()
+    print(f"Semantic DB written to {out} (rows={n_rows}, dim={dim})")
+    if cache_size > 0:
+        print(cache_summary(hits, misses) + (f" across {workers} workers" if workers > 1 else ""))
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -183,12 +621,34 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     p.add_argument("--source", required=True, help="Path to the content SQLite (from json_to_sqlite_cli.py)")
     p.add_argument("--out", required=True, help="Destination semantic SQLite path")
     p.add_argument("--dim", type=int, default=384, help="Vector dimension (default: 384)")
+    p.add_argument("--batch", type=int, default=512, help="Verses per fetch, NumPy batch and worker shard (default: 512)")
+    p.add_argument("--cache-size", type=int, default=200_000,
+                   help="Tokens kept in the feature-hash LRU; 0 disables it (default: 200000)")
+    p.add_argument("--workers", type=int, default=1, help="Embedding processes (default: 1, serial)")
+    p.add_argument("--storage", choices=VECTOR_FORMATS, default="f32",
+                   help="Vector blob layout, see the module docstring (default: f32)")
+    p.add_argument("--matrix-chunk", type=int, default=8192, help="Rows per embedding_matrix blob (default: 8192)")
     return p.parse_args(argv)
 
 
 def main(argv: Sequence[str] | None = None) -> None:
     args = parse_args(argv)
-    build_semantic_db(Path(args.source), Path(args.out), args.dim)
+    if args.batch <= 0:
+        raise SystemExit("--batch must be positive")
+    if args.workers <= 0:
+        raise SystemExit("--workers must be positive")
+    if args.matrix_chunk <= 0:
+        raise SystemExit("--matrix-chunk must be positive")
+    build_semantic_db(
+        Path(args.source),
+        Path(args.out),
+        args.dim,
+        args.batch,
+        args.cache_size,
+        args.workers,
+        args.storage,
+        args.matrix_chunk,
+    )
 
 
 if __name__ == "__main__":
@@ -1,11 +1,58 @@
 #!/usr/bin/env python3
-# Populate the `embeddings` table in the semantic search database.
+# Populate the semantic search database's vectors (the `embeddings` rows, then
+# moved into `embedding_matrix` by write_matrix).
+# --format f16|int8 stores quantized vectors (layout in meta.vector_format, see
+# build_semantic_pack.py) and reports recall@k against the float32 vectors.
+# Passages are batched by token length (--batch-tokens) and tokenized one
+# batch at a time. Truncation and padding follow tokenizer.json (128 tokens,
+# fixed padding for the shipped model) so the vectors match earlier packs;
+# --trim-padding trades that for shorter batches and changes every vector.
+# --model picks fp32, the int8 model_quantized.onnx or model_pooled.onnx
+# (pooling and normalization inside the graph, see build_pooled_model.py); the
+# ORT session options are flags too, and --bench N prints passages/sec per
+# model and thread count.
+# --procs N spreads the batches over N pinned worker sessions; this process
+# remains the only writer.
+# Vectors are cached in docs/scripts/.cache/embeddings.sqlite keyed by model,
+# max_len, padding, pooling and text, so a rebuild only encodes changed passages.
+#
+# Other scripts can reuse the model through Encoder; nothing is loaded until
+# the first encode:
+#     from encode_semantic import Encoder
+#     vecs = Encoder().encode(["query text"])   # [B, H] float32, unit rows
 
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
 import sqlite3
+import time
 import numpy as np
-import onnxruntime as ort
-from tokenizers import Tokenizer
+
+from build_semantic_pack import pack_vector, recall_at_k, unpack_vector, write_matrix
+
+EXPORT_FORMATS = ("f32", "f16", "int8")
+
+# All live in onnx_model/. model_pooled.onnx is model.onnx with pooling + L2
+# norm in the graph (build_pooled_model.py); it is build-only, so it is
+# gitignored and left out of the browser manifest.json
+MODELS = {"fp32": "model.onnx", "int8": "model_quantized.onnx", "pooled": "model_pooled.onnx"}
+# --graph-opt -> ort.GraphOptimizationLevel member
+GRAPH_OPT = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+# Pooling applied in Encoder.encode_ids(); part of the embedding cache key
+POOLING = "mean-l2"
+
+HERE = Path(__file__).resolve().parent
+CACHE_PATH = HERE / ".cache" / "embeddings.sqlite"
 
 
 # ---------- Path resolution ----------
@@ -24,97 +71,472 @@ def find_semantic_root(start: Path) -> Path:
     raise FileNotFoundError(f"semantic assets not found upward from: {start}")
 
 
-HERE = Path(__file__).resolve().parent
-ROOT = find_semantic_root(HERE)                 # <repo>/assets/data/semantic
-MDIR = ROOT / "onnx_model"
-
-# Resolve DB (e.g., library.semantic.v01.sqlite)
-DB_CANDIDATES = sorted(ROOT.glob("library.semantic.*.sqlite"))
-if not DB_CANDIDATES:
-    raise FileNotFoundError(f"No semantic DB found in {ROOT}")
-DB_PATH = DB_CANDIDATES[0]
+def find_semantic_db(root: Path) -> Path:
+    """The semantic DB (e.g., library.semantic.v01.sqlite) in `root`."""
+    cands = sorted(root.glob("library.semantic.*.sqlite"))
+    if not cands:
+        raise FileNotFoundError(f"No semantic DB found in {root}")
+    return cands[0]
 
 
 # ---------- Model + tokenizer ----------
 
-tok = Tokenizer.from_file(str(MDIR / "tokenizer.json"))
-sess = ort.InferenceSession(str(MDIR / "model.onnx"), providers=["CPUExecutionProvider"])
+def session_options(intra_threads=0, inter_threads=0, graph_opt="all",
+                    mem_pattern=True, cpu_arena=True, optimized_path=None):
+    """ORT SessionOptions; 0 threads leaves the choice to ORT."""
+    import onnxruntime as ort
 
-# Resolve input/output names robustly
-_input_names = {i.name for i in sess.get_inputs()}
-def pick(candidates):
-    for n in candidates:
-        if n in _input_names:
-            return n
-    return None
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = intra_threads
+    so.inter_op_num_threads = inter_threads
+    if inter_threads > 1:
+        # inter-op threads only run independent graph nodes in parallel mode
+        so.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    so.graph_optimization_level = getattr(ort.GraphOptimizationLevel, GRAPH_OPT[graph_opt])
+    so.enable_mem_pattern = mem_pattern
+    so.enable_cpu_mem_arena = cpu_arena
+    if optimized_path:
+        # ORT writes the optimized graph here; load it later with graph_opt="disable"
+        so.optimized_model_filepath = str(optimized_path)
+    return so
 
-IN_IDS  = pick(["input_ids", "ids", "input"])
-IN_ATTN = pick(["attention_mask", "attn_mask", "mask"])
-IN_TTOK = pick(["token_type_ids", "token_type_id", "segment_ids"])  # may be None
-if IN_IDS is None or IN_ATTN is None:
-    raise KeyError(f"Model inputs not recognized. Available: {sorted(_input_names)}")
 
-OUT0 = sess.get_outputs()[0].name  # expect hidden states [B,S,H]
+def length_buckets(lengths, max_tokens):
+    """
+    Group row indices into batches of similar token length.
 
+    Rows are sorted by length and cut greedily so that rows * longest row
+    (the padded [B,S] size the model sees) stays within max_tokens.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, cur = [], []
+    for i in order:
+        longest = max(lengths[i], 1)  # sorted, so the newcomer is the longest
+        if cur and (len(cur) + 1) * longest > max_tokens:
+            batches.append(cur)
+            cur = []
+        cur.append(i)
+    if cur:
+        batches.append(cur)
+    return batches
 
-# ---------- Encoding ----------
 
-def encode(texts, max_len=256):
+class Encoder:
     """
-    texts: list[str] -> np.ndarray shape [B, H], L2-normalized.
+    Tokenizer + ONNX session for one model, each created on first use.
+
+    model_dir defaults to the onnx_model/ directory of the semantic assets;
+    model is a MODELS key or a path to an .onnx file; options are
+    session_options() keywords.
+
+    max_len defaults to the truncation length in tokenizer.json. When
+    tokenizer.json pads to a fixed length (128 for the shipped model), every
+    passage is padded to max_len and the pad positions stay in the attention
+    mask and the mean, as the pack has always been built. trim_padding pads
+    each batch only to its longest passage and leaves padding out of the
+    mean: faster, but the vectors change, so the whole pack must be
+    re-encoded with it.
     """
-    batch = tok.encode_batch(texts)
 
-    # Token ids truncated to max_len
-    ids  = [e.ids[:max_len] for e in batch]
-    # Attention mask of ones for actual tokens
-    attn = [[1] * len(x) for x in ids]
+    def __init__(self, model_dir=None, model="fp32", max_len=None, trim_padding=False, **options):
+        self.model_dir = Path(model_dir) if model_dir else find_semantic_root(HERE) / "onnx_model"
+        self.model_path = self.model_dir / MODELS[model] if model in MODELS else Path(model)
+        self.options = options
+        self._max_len = max_len
+        self._trim = trim_padding
+        self._config = None
+        self._tok = None
+        self._sess = None
+
+    def _tokenizer_config(self):
+        """(max_len, padding) resolved against tokenizer.json's truncation/padding."""
+        if self._config is None:
+            cfg = json.loads((self.model_dir / "tokenizer.json").read_text(encoding="utf-8"))
+            strategy = (cfg.get("padding") or {}).get("strategy")
+            fixed = strategy.get("Fixed") if isinstance(strategy, dict) else None
+            max_len = self._max_len or (cfg.get("truncation") or {}).get("max_length") or fixed or 512
+            self._config = (max_len, "trim" if self._trim or fixed is None else "fixed")
+        return self._config
+
+    @property
+    def max_len(self):
+        return self._tokenizer_config()[0]
+
+    @property
+    def padding(self):
+        """Padding mode, "fixed" (pad to max_len, pads in the mask) or "trim"; part of the cache key."""
+        return self._tokenizer_config()[1]
+
+    @property
+    def tokenizer(self):
+        if self._tok is None:
+            from tokenizers import Tokenizer
+
+            tok = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+            # Truncate natively; tokenize() pads into NumPy arrays itself
+            tok.enable_truncation(max_length=self.max_len)
+            tok.no_padding()
+            self._tok = tok
+        return self._tok
+
+    @property
+    def session(self):
+        if self._sess is None:
+            import onnxruntime as ort
+
+            if not self.model_path.is_file():
+                raise SystemExit(f"ONNX model not found: {self.model_path}")
+            sess = ort.InferenceSession(str(self.model_path), sess_options=session_options(**self.options),
+                                        providers=["CPUExecutionProvider"])
+
+            # Resolve input/output names robustly
+            input_names = {i.name for i in sess.get_inputs()}
+            def pick(candidates):
+                for n in candidates:
+                    if n in input_names:
+                        return n
+                return None
+
+            self.in_ids  = pick(["input_ids", "ids", "input"])
+            self.in_attn = pick(["attention_mask", "attn_mask", "mask"])
+            self.in_ttok = pick(["token_type_ids", "token_type_id", "segment_ids"])  # may be None
+            if self.in_ids is None or self.in_attn is None:
+                raise KeyError(f"Model inputs not recognized. Available: {sorted(input_names)}")
+
+            out = sess.get_outputs()[0]
+            self.out0 = out.name  # hidden states [B,S,H], or [B,H] if the graph pools
+            self.pooled = len(out.shape) == 2
+            self._sess = sess
+        return self._sess
+
+    def model_sha256(self):
+        return file_sha256(self.model_path)
+
+    def token_lengths(self, texts):
+        """Tokens per text after truncation; every text is max_len long with fixed padding."""
+        if self.padding == "fixed":
+            return [self.max_len] * len(texts)
+        return [len(e) for e in self.tokenizer.encode_batch(texts)]
+
+    def tokenize(self, texts):
+        """
+        texts: list[str] -> (ids, attn), both np.int64 [B,S].
+
+        Call it per batch: rows are right-padded with 0 to max_len (fixed
+        padding, mask all ones) or to the longest text of `texts` (trim).
+        """
+        batch = self.tokenizer.encode_batch(texts)
+        fixed = self.padding == "fixed"
+        cols = self.max_len if fixed else max((len(e) for e in batch), default=0)
+        ids = np.zeros((len(batch), cols), dtype=np.int64)                   # [B,S]
+        attn = np.ones_like(ids) if fixed else np.zeros_like(ids)            # [B,S]
+        for row, e in enumerate(batch):
+            ids[row, :len(e)] = e.ids
+            if not fixed:
+                attn[row, :len(e)] = 1
+        return ids, attn
+
+    def encode_ids(self, ids, attn):
+        """
+        ids, attn: np.int64 [B,S] from tokenize() -> np.ndarray shape [B, H], L2-normalized.
+        """
+        sess = self.session
+        feeds = {self.in_ids: ids, self.in_attn: attn}
+        if self.in_ttok is not None:
+            feeds[self.in_ttok] = np.zeros_like(ids, dtype=np.int64)  # segment ids
+
+        if self.pooled:
+            return sess.run([self.out0], feeds)[0]      # [B,H], already unit rows
+
+        hidden = sess.run([self.out0], feeds)[0]        # [B,S,H]
+        mask = attn[..., None].astype(np.float32)       # [B,S,1]
+
+        # Mean pooling with mask:
+        # μ = (Σ_t h_t * m_t) / (Σ_t m_t)
+        summed = (hidden * mask).sum(axis=1)            # [B,H]
+        denom = np.clip(mask.sum(axis=1), 1e-9, None)   # [B,1]
+        mean = summed / denom                           # [B,H]
+
+        # L2 normalize
+        norm = np.linalg.norm(mean, axis=1, keepdims=True) + 1e-12
+        emb = (mean / norm).astype(np.float32)          # [B,H]
+        return emb
+
+    def encode_buckets(self, texts, batch_tokens):
+        """Yield (row indices, vectors) per length bucket of texts, each bucket tokenized on its own."""
+        for batch in length_buckets(self.token_lengths(texts), batch_tokens):
+            yield batch, self.encode_ids(*self.tokenize([texts[i] for i in batch]))
 
-    # Left-pad to max length in the batch
-    maxL = max(len(x) for x in ids) if ids else 1
-    ids  = np.array([x + [0]*(maxL - len(x)) for x in ids],  dtype=np.int64)  # [B,S]
-    attn = np.array([x + [0]*(maxL - len(x)) for x in attn], dtype=np.int64)  # [B,S]
+    def encode(self, texts):
+        """
+        texts: list[str] -> np.ndarray shape [B, H], L2-normalized.
+        """
+        return self.encode_ids(*self.tokenize(texts))
 
-    feeds = {IN_IDS: ids, IN_ATTN: attn}
-    if IN_TTOK is not None:
-        feeds[IN_TTOK] = np.zeros_like(ids, dtype=np.int64)  # segment ids
 
-    hidden = sess.run([OUT0], feeds)[0]             # [B,S,H]
-    mask = attn[..., None].astype(np.float32)       # [B,S,1]
+# ---------- Process pool ----------
 
-    # Mean pooling with mask:
-    # μ = (Σ_t h_t * m_t) / (Σ_t m_t)
-    summed = (hidden * mask).sum(axis=1)            # [B,H]
-    denom = np.clip(mask.sum(axis=1), 1e-9, None)   # [B,1]
-    mean = summed / denom                           # [B,H]
+_worker_encoder = None
 
-    # L2 normalize
-    norm = np.linalg.norm(mean, axis=1, keepdims=True) + 1e-12
-    emb = (mean / norm).astype(np.float32)          # [B,H]
-    return emb
+
+def core_slices(procs):
+    """Split the CPUs this process may use into procs contiguous slices, one per worker."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    if procs >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(procs)]
+    n = len(cpus) // procs
+    return [cpus[i * n:(i + 1) * n] if i < procs - 1 else cpus[i * n:] for i in range(procs)]
+
+
+def _init_encode_worker(slices, model_dir, model, options):
+    # Each worker takes one core slice, pins itself to it and sizes its
+    # intra-op pool to match unless --intra-threads was given.
+    global _worker_encoder
+    cores = slices.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    options = dict(options)
+    if not options.get("intra_threads"):
+        options["intra_threads"] = len(cores)
+    _worker_encoder = Encoder(model_dir, model, **options)
+    _worker_encoder.session
+
+
+def encode_job(job):
+    """Pool task: one length bucket's (ids, attn) -> vectors."""
+    return _worker_encoder.encode_ids(*job)
+
+
+def encode_buckets_pool(encoder, texts, batch_tokens, procs):
+    """encoder.encode_buckets() over procs worker processes, in order; at most 2*procs buckets in flight."""
+    ctx = mp.get_context()
+    slices = ctx.Queue()
+    for cores in core_slices(procs):
+        slices.put(cores)
+    initargs = (slices, str(encoder.model_dir), str(encoder.model_path), encoder.options)
+    with ProcessPoolExecutor(max_workers=procs, mp_context=ctx,
+                             initializer=_init_encode_worker, initargs=initargs) as pool:
+        pending = deque()
+        for batch in length_buckets(encoder.token_lengths(texts), batch_tokens):
+            job = encoder.tokenize([texts[i] for i in batch])  # tokenized here, one bucket at a time
+            pending.append((batch, pool.submit(encode_job, job)))
+            if len(pending) >= 2 * procs:
+                batch, fut = pending.popleft()
+                yield batch, fut.result()
+        while pending:
+            batch, fut = pending.popleft()
+            yield batch, fut.result()
+
+
+# ---------- Embedding cache ----------
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    float32 vectors keyed by sha256(model sha256, max_len, padding, pooling, text).
+
+    Any change to the model file, truncation or pooling gives new keys, so
+    stale vectors are never returned; they are simply no longer looked up.
+    """
+
+    def __init__(self, path, model_sha, max_len, padding, pooling=POOLING):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(str(path))
+        self.con.execute("CREATE TABLE IF NOT EXISTS vectors(key BLOB PRIMARY KEY, vector BLOB NOT NULL) WITHOUT ROWID")
+        self.prefix = f"{model_sha}\0{max_len}\0{padding}\0{pooling}\0".encode("utf-8")
+
+    def key(self, text):
+        return hashlib.sha256(self.prefix + text.encode("utf-8")).digest()
+
+    def get(self, key):
+        row = self.con.execute("SELECT vector FROM vectors WHERE key = ?", (key,)).fetchone()
+        return np.frombuffer(row[0], dtype="<f4") if row else None
+
+    def put_many(self, items):
+        self.con.executemany("INSERT OR REPLACE INTO vectors(key, vector) VALUES(?, ?)",
+                             ((key, np.asarray(vec, dtype="<f4").tobytes()) for key, vec in items))
+
+    def close(self):
+        self.con.commit()
+        self.con.close()
 
 
 # ---------- Database I/O ----------
 
-def main():
-    con = sqlite3.connect(str(DB_PATH))
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Encode passages with the ONNX model into the semantic DB")
+    p.add_argument("--db", default=None,
+                   help="Semantic SQLite (default: assets/data/semantic/library.semantic.*.sqlite)")
+    p.add_argument("--model-dir", default=None,
+                   help="Directory with tokenizer.json and the ONNX models (default: assets/data/semantic/onnx_model)")
+    p.add_argument("--format", choices=EXPORT_FORMATS, default="f32",
+                   help="Stored vector format: float32, float16 or int8 with a per-vector scale (default: f32)")
+    p.add_argument("--max-len", type=int, default=None,
+                   help="Tokens kept per passage (default: tokenizer.json truncation, 128 for the shipped model)")
+    p.add_argument("--trim-padding", action="store_true",
+                   help="Pad batches only to their longest passage and keep padding out of the mean; "
+                        "faster, but changes every vector (default: tokenizer.json fixed padding)")
+    p.add_argument("--batch-tokens", type=int, default=16384,
+                   help="Padded tokens per model call; passages are batched by length up to this (default: 16384)")
+    p.add_argument("--model", default="fp32",
+                   help="fp32 (model.onnx), int8 (model_quantized.onnx), pooled (model_pooled.onnx) "
+                        "or a path to an .onnx file (default: fp32)")
+    p.add_argument("--intra-threads", type=int, default=0, help="ORT intra-op threads, 0 = ORT default (default: 0)")
+    p.add_argument("--inter-threads", type=int, default=0,
+                   help="ORT inter-op threads; >1 switches to parallel execution mode (default: 0)")
+    p.add_argument("--graph-opt", choices=tuple(GRAPH_OPT), default="all", help="Graph optimization level (default: all)")
+    p.add_argument("--no-mem-pattern", action="store_true", help="Disable ORT memory pattern planning")
+    p.add_argument("--no-cpu-arena", action="store_true", help="Disable the ORT CPU memory arena")
+    p.add_argument("--save-optimized", default=None, metavar="PATH",
+                   help="Write the optimized graph to PATH for reuse with --model PATH --graph-opt disable")
+    p.add_argument("--procs", type=int, default=1,
+                   help="Encoder worker processes, each with its own session pinned to a slice of cores (default: 1)")
+    p.add_argument("--cache", default=str(CACHE_PATH),
+                   help="Persistent embedding cache SQLite (default: docs/scripts/.cache/embeddings.sqlite)")
+    p.add_argument("--no-cache", action="store_true", help="Encode every passage and leave the cache untouched")
+    p.add_argument("--bench", type=int, default=0, metavar="N",
+                   help="Time the first N passages for each model and thread count, print passages/sec, write nothing")
+    p.add_argument("--recall-k", type=int, default=10, help="k for the recall@k report on quantized formats (default: 10)")
+    p.add_argument("--recall-queries", type=int, default=200, help="Query rows for the recall report (default: 200)")
+    return p.parse_args(argv)
+
+
+def session_kwargs(args):
+    """session_options() keyword arguments from the CLI flags (picklable, unlike SessionOptions)."""
+    return dict(
+        intra_threads=args.intra_threads,
+        inter_threads=args.inter_threads,
+        graph_opt=args.graph_opt,
+        mem_pattern=not args.no_mem_pattern,
+        cpu_arena=not args.no_cpu_arena,
+        optimized_path=args.save_optimized,
+    )
+
+
+def benchmark(rows, args):
+    """Print passages/sec for each shipped model x intra-op thread count on the first rows."""
+    texts = [r[1] for r in rows[:args.bench]]
+    if not texts:
+        raise SystemExit("No passages to benchmark")
+    cpus = os.cpu_count() or 1
+    threads = [args.intra_threads] if args.intra_threads else sorted({1, max(1, cpus // 2), cpus})
+    models = [args.model] if args.model not in MODELS else list(MODELS)
+    print(f"{len(texts)} passages, graph_opt={args.graph_opt}, inter_threads={args.inter_threads}")
+    print(f"{'model':<22} {'intra':>5} {'passages/s':>11}")
+    for model in models:
+        for n in threads:
+            enc = Encoder(args.model_dir, model, args.max_len, args.trim_padding,
+                          **dict(session_kwargs(args), intra_threads=n))
+            if not enc.model_path.is_file():
+                print(f"{model:<22} {'-':>5} {'missing':>11}")
+                break
+            enc.encode(texts[:1])  # warm-up: builds the session, first run plans memory
+            t0 = time.perf_counter()
+            for _ in enc.encode_buckets(texts, args.batch_tokens):
+                pass
+            print(f"{model:<22} {n:>5} {len(texts) / (time.perf_counter() - t0):>11.1f}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.procs < 1:
+        raise SystemExit("--procs must be at least 1")
+    if args.procs > 1 and args.save_optimized:
+        raise SystemExit("--save-optimized needs a single process; drop --procs")
+    db_path = Path(args.db) if args.db else find_semantic_db(find_semantic_root(HERE))
+    if not db_path.is_file():
+        raise SystemExit(f"Semantic DB not found: {db_path}")
+    encoder = Encoder(args.model_dir, args.model, args.max_len, args.trim_padding, **session_kwargs(args))
+    if args.batch_tokens < encoder.max_len:
+        raise SystemExit(f"--batch-tokens must be at least the {encoder.max_len} tokens kept per passage")
+    con = sqlite3.connect(str(db_path))
     cur = con.cursor()
 
     rows = cur.execute("SELECT id, text FROM passages ORDER BY id").fetchall()
-    B = 64
-    for i in range(0, len(rows), B):
-        batch = rows[i:i+B]
-        ids = [r[0] for r in batch]
-        texts = [r[1] for r in batch]
-        vecs = encode(texts)
+    if args.bench:
+        con.close()
+        benchmark(rows, args)
+        return
+
+    if not encoder.model_path.is_file():
+        raise SystemExit(f"ONNX model not found: {encoder.model_path}")
+    cache = None if args.no_cache else EmbeddingCache(Path(args.cache), encoder.model_sha256(),
+                                                      encoder.max_len, encoder.padding)
+    t0 = time.perf_counter()
+    texts = [r[1] for r in rows]
+    base, stored = [None] * len(rows), [None] * len(rows)  # kept only for the recall report
+    dim = blob_size = 0
+
+    def store(idx, vecs):
+        nonlocal dim, blob_size
+        blobs = [pack_vector(vec.tobytes(), args.format) for vec in vecs]
         cur.executemany(
             "INSERT OR REPLACE INTO embeddings(id, vector) VALUES(?, ?)",
-            [(pid, memoryview(vec.tobytes())) for pid, vec in zip(ids, vecs)]
+            [(rows[i][0], memoryview(blob)) for i, blob in zip(idx, blobs)]
         )
+        dim, blob_size = len(vecs[0]), len(blobs[0])
+        if args.format != "f32":
+            for i, vec, blob in zip(idx, vecs, blobs):
+                base[i] = vec
+                stored[i] = np.frombuffer(unpack_vector(blob, dim, args.format), dtype="<f4")
+
+    # Passages whose text, model and settings are unchanged come from the cache
+    keys = [cache.key(t) for t in texts] if cache else None
+    todo, hits = [], []
+    for i in range(len(rows)):
+        vec = cache.get(keys[i]) if cache else None
+        if vec is None:
+            todo.append(i)
+            continue
+        hits.append((i, vec))
+        if len(hits) == 1024:
+            store(*zip(*hits))
+            hits = []
+    if hits:
+        store(*zip(*hits))
+
+    if todo:
+        # Batch passages of similar length (with --trim-padding short verses are
+        # then not padded out to the longest one in an id-ordered batch); each
+        # batch is tokenized only when it is encoded.
+        pending = [texts[i] for i in todo]
+        if args.procs > 1:
+            # Workers encode; this process stays the only writer of `embeddings`
+            results = encode_buckets_pool(encoder, pending, args.batch_tokens, args.procs)
+        else:
+            results = encoder.encode_buckets(pending, args.batch_tokens)
+        for batch, vecs in results:
+            idx = [todo[j] for j in batch]
+            store(idx, vecs)
+            if cache:
+                cache.put_many((keys[i], vec) for i, vec in zip(idx, vecs))
 
+    elapsed = time.perf_counter() - t0
+    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('vector_format', ?)", (args.format,))
+    if rows:
+        write_matrix(con, dim)  # move the new rows into the chunked matrix, then VACUUM
     con.commit()
     con.close()
+    if cache:
+        cache.close()
     print("Done. Embeddings populated.")
+    print(f"{len(rows)} passages: {len(rows) - len(todo)} from cache, {len(todo)} encoded "
+          f"with {encoder.model_path.name} x {args.procs} proc(s) in {elapsed:.1f}s ({len(todo) / max(elapsed, 1e-9):.1f} passages/s)")
+    if rows and args.format != "f32":
+        base, stored = np.stack(base), np.stack(stored)
+        r = recall_at_k(base, stored, args.recall_k, args.recall_queries)
+        print(f"{args.format}: {stored.shape[1]}-dim vectors in {blob_size} bytes (f32: {4 * stored.shape[1]}), "
+              f"recall@{args.recall_k} vs float32 = {r:.4f}")
 
 
 if __name__ == "__main__":
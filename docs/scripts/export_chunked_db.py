@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Split the library SQLite into fixed-size chunks for sqljs-httpvfs.
+
+Writes the sqljs-httpvfs "chunked" server layout under docs/assets/data/db/:
+  - library.<hash>.sqlite.000, .001, ... : the DB cut into serverChunkSize
+    pieces; <hash> is the start of the DB's SHA-256, so every chunk name is
+    immutable and can be cached forever by a CDN,
+  - library.chunked.json : the config passed to createDbWorker
+    ({from: "jsonconfig", configUrl: ...}); this is the only file whose
+    content changes between builds.
+
+requestChunkSize is the DB page_size and serverChunkSize is rounded to a
+multiple of it, so a range read never straddles two chunk files. Chunks from
+earlier builds are removed.
+
+js/db.js still fetches the whole library.<version>.sqlite, so this is not
+part of run.py and docs/assets/data/db/ is gitignored; run it by hand when
+switching db.js to createDbWorker.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Sequence
+
+HERE = Path(__file__).resolve().parent
+DATA = HERE.parent / "assets" / "data"
+OUT_DIR = DATA / "db"
+CONFIG_NAME = "library.chunked.json"
+SUFFIX_LENGTH = 3
+
+
+def find_library_db() -> Path:
+    cands = sorted(p for p in DATA.glob("library.*.sqlite") if p.parent == DATA)
+    if not cands:
+        raise SystemExit("No library DB found under docs/assets/data/. Expected library.<version>.sqlite")
+    return cands[0]
+
+
+def db_page_size(db_path: Path) -> int:
+    with open(db_path, "rb") as f:
+        header = f.read(100)
+    if len(header) < 100 or not header.startswith(b"SQLite format 3\x00"):
+        raise SystemExit(f"Not a SQLite database: {db_path}")
+    # Bytes 18/19 are the write/read format versions; 2 means WAL, which
+    # httpvfs cannot read from a static file.
+    if header[18] == 2 or header[19] == 2:
+        raise SystemExit(f"{db_path} is in WAL mode; checkpoint it and set journal_mode=DELETE first")
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return int(con.execute("PRAGMA page_size").fetchone()[0])
+    finally:
+        con.close()
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def export_chunks(db_path: Path, out_dir: Path, server_chunk_size: int, hash_length: int) -> dict:
+    page_size = db_page_size(db_path)
+    chunk = max(page_size, server_chunk_size - server_chunk_size % page_size)
+    size = db_path.stat().st_size
+    n_chunks = max(1, -(-size // chunk))
+    if n_chunks > 10 ** SUFFIX_LENGTH:
+        raise SystemExit(f"{n_chunks} chunks do not fit a {SUFFIX_LENGTH}-digit suffix; raise --server-chunk-size")
+
+    prefix = f"library.{file_sha256(db_path)[:hash_length]}.sqlite."
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    with open(db_path, "rb") as src:
+        for i in range(n_chunks):
+            name = f"{prefix}{i:0{SUFFIX_LENGTH}d}"
+            data = src.read(chunk)
+            target = out_dir / name
+            if not (target.exists() and target.stat().st_size == len(data)):
+                tmp = target.with_name(name + ".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(target)
+            written.add(name)
+
+    for stale in out_dir.glob("library.*.sqlite.*"):
+        if stale.name not in written:
+            stale.unlink()
+
+    config = {
+        "serverMode": "chunked",
+        "requestChunkSize": page_size,
+        "databaseLengthBytes": size,
+        "serverChunkSize": chunk,
+        "urlPrefix": prefix,
+        "suffixLength": SUFFIX_LENGTH,
+    }
+    tmp = out_dir / (CONFIG_NAME + ".tmp")
+    tmp.write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(out_dir / CONFIG_NAME)
+    return config
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export the library SQLite as sqljs-httpvfs chunks")
+    p.add_argument("--db", default=None, help="Library SQLite (default: docs/assets/data/library.*.sqlite)")
+    p.add_argument("--out", default=str(OUT_DIR), help="Output directory (default: docs/assets/data/db)")
+    p.add_argument("--server-chunk-size", type=int, default=10 * 1024 * 1024,
+                   help="Bytes per chunk file, rounded down to a multiple of page_size (default: 10 MiB)")
+    p.add_argument("--hash-length", type=int, default=16, help="Hex digits of SHA-256 in chunk names (default: 16)")
+    return p.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    db_path = Path(args.db) if args.db else find_library_db()
+    if not db_path.exists():
+        raise SystemExit(f"Library SQLite not found: {db_path}")
+    if args.server_chunk_size <= 0:
+        raise SystemExit("--server-chunk-size must be positive")
+    out_dir = Path(args.out)
+    cfg = export_chunks(db_path, out_dir, args.server_chunk_size, args.hash_length)
+    n = -(-cfg["databaseLengthBytes"] // cfg["serverChunkSize"])
+    print(f"Wrote {n} chunk(s) {cfg['urlPrefix']}* + {CONFIG_NAME} to {out_dir} "
+          f"(serverChunkSize={cfg['serverChunkSize']}, requestChunkSize={cfg['requestChunkSize']})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Write the semantic pack's vectors as raw sidecar files for Python tooling.
+
+  - embeddings.f32 : N x dim little-endian float32, row-major, unit-norm rows
+  - ids.u32        : N little-endian uint32 passage ids, row i of the matrix
+
+Rows are in passage id order; dim is meta.dim of the pack.  Python can map
+the matrix with no parsing:
+
+    np.memmap("embeddings.f32", dtype="<f4", mode="r").reshape(-1, dim)
+
+The browser reads the vectors from the pack's embedding_matrix, so the
+sidecars are a local build artifact: run.py writes them to
+docs/scripts/.cache/ (the default --out), and they are not part of
+manifest.json.
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Sequence
+
+from build_semantic_pack import iter_matrix_chunks
+
+HERE = Path(__file__).resolve().parent
+SEM = HERE.parent / "assets" / "data" / "semantic"
+OUT_DIR = HERE / ".cache"
+VECTORS_NAME = "embeddings.f32"
+IDS_NAME = "ids.u32"
+
+
+def find_semantic_db() -> Path:
+    cands = sorted(SEM.glob("library.semantic.*.sqlite"))
+    if not cands:
+        raise SystemExit(f"No semantic DB found in {SEM}")
+    return cands[0]
+
+
+def export_sidecars(db_path: Path, out_dir: Path) -> tuple[int, int]:
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        row = con.execute("SELECT value FROM meta WHERE key='dim'").fetchone()
+        if not row:
+            raise SystemExit(f"meta.dim missing in {db_path}")
+        dim = int(row[0])
+        chunks = iter_matrix_chunks(con, dim)  # decoded from any meta.vector_format
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        vec_tmp = out_dir / (VECTORS_NAME + ".tmp")
+        ids_tmp = out_dir / (IDS_NAME + ".tmp")
+        n_rows = 0
+        with open(vec_tmp, "wb") as fv, open(ids_tmp, "wb") as fi:
+            for ids, vectors in chunks:
+                if len(vectors) != len(ids) // 4 * dim * 4:
+                    raise SystemExit(f"Vector chunk does not match dim={dim} in {db_path}")
+                fi.write(ids)
+                fv.write(vectors)
+                n_rows += len(ids) // 4
+    finally:
+        con.close()
+    vec_tmp.replace(out_dir / VECTORS_NAME)
+    ids_tmp.replace(out_dir / IDS_NAME)
+    return n_rows, dim
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export semantic vectors as embeddings.f32 + ids.u32 sidecars")
+    p.add_argument("--db", default=None, help="Semantic SQLite (default: assets/data/semantic/library.semantic.*.sqlite)")
+    p.add_argument("--out", default=None, help="Output directory (default: docs/scripts/.cache)")
+    return p.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    db_path = Path(args.db) if args.db else find_semantic_db()
+    if not db_path.exists():
+        raise SystemExit(f"Semantic SQLite not found: {db_path}")
+    out_dir = Path(args.out) if args.out else OUT_DIR
+    n_rows, dim = export_sidecars(db_path, out_dir)
+    print(f"Wrote {out_dir / VECTORS_NAME} ({n_rows} x {dim} float32) and {out_dir / IDS_NAME}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
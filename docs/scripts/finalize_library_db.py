@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Rewrite the site library SQLite for HTTP range reads.
+
+The importer leaves the DB with the default page size and its pages in
+insertion order. This step copies it into a fresh file (a VACUUM with a
+chosen table order):
+  - page_size set to the range-request chunk size (default 4096, matching
+    sqljs-httpvfs' requestChunkSize),
+  - tables written in the order the site reads them (works -> divisions ->
+    verses -> wide texts/word-by-word), each followed by its indexes, so a
+    page view touches a few contiguous runs of pages,
+  - build-only tables (verse_texts, tokens, glosses, FTS shadow tables) last,
+  - ANALYZE for the planner.
+
+It then reports, before and after, how many contiguous page runs the
+read-path tables occupy (via dbstat) and how many pages each of the site's
+canonical queries reads on a cold connection, using the `sqlite3` CLI's
+`.stats` (Python's sqlite3 module does not expose pager counters).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+from typing import Sequence
+
+HERE = Path(__file__).resolve().parent
+DATA = HERE.parent / "assets" / "data"
+
+# Tables the site reads, in page-view order; anything else follows.
+READ_ORDER = (
+    "work_types",
+    "works",
+    "divisions",
+    "verses",
+    "verse_texts_wide",
+    "verse_wfw",
+)
+
+
+def find_library_db() -> Path:
+    cands = sorted(p for p in DATA.glob("library.*.sqlite") if p.parent == DATA)
+    if not cands:
+        raise SystemExit("No library DB found under docs/assets/data/. Expected library.<version>.sqlite")
+    return cands[0]
+
+
+def read_rank(name: str) -> tuple[int, str]:
+    return (READ_ORDER.index(name), "") if name in READ_ORDER else (len(READ_ORDER), name)
+
+
+def clustered_copy(src: Path, dest: Path, page_size: int) -> None:
+    if dest.exists():
+        dest.unlink()
+    con = sqlite3.connect(str(dest))
+    con.execute(f"PRAGMA page_size = {int(page_size)}")
+    con.execute("PRAGMA journal_mode = OFF")
+    con.execute("PRAGMA synchronous = OFF")
+    con.execute("ATTACH DATABASE ? AS src", (str(src),))
+
+    schema = con.execute(
+        "SELECT type, name, tbl_name, sql FROM src.sqlite_master WHERE sql IS NOT NULL ORDER BY rowid"
+    ).fetchall()
+    virtual = [n for t, n, _, sql in schema if t == "table" and sql.upper().startswith("CREATE VIRTUAL TABLE")]
+
+    def is_shadow(name: str) -> bool:
+        return any(name.startswith(v + "_") for v in virtual)
+
+    tables = sorted(
+        (n for t, n, _, sql in schema
+         if t == "table" and n not in virtual and not is_shadow(n) and not n.startswith("sqlite_")),
+        key=read_rank,
+    )
+    sql_of = {n: sql for _, n, _, sql in schema}
+    indexes: dict[str, list[str]] = {}
+    for t, n, tbl, sql in schema:
+        if t == "index":
+            indexes.setdefault(tbl, []).append(sql)
+
+    for name in tables:
+        con.execute(sql_of[name])
+        con.execute(f'INSERT INTO main."{name}" SELECT * FROM src."{name}" ORDER BY rowid')
+        for sql in indexes.get(name, []):
+            con.execute(sql)
+        con.commit()
+
+    # Recreate virtual tables, then carry their shadow tables over verbatim
+    # (a contentless FTS5 index cannot be repopulated from the table itself).
+    for name in virtual:
+        con.execute(sql_of[name])
+        for _, shadow, _, _ in schema:
+            if shadow.startswith(name + "_") and shadow not in virtual:
+                con.execute(f'DELETE FROM main."{shadow}"')
+                con.execute(f'INSERT INTO main."{shadow}" SELECT * FROM src."{shadow}"')
+        con.commit()
+
+    for t, n, _, sql in schema:
+        if t in ("view", "trigger"):
+            con.execute(sql)
+    user_version = con.execute("PRAGMA src.user_version").fetchone()[0]
+    con.execute(f"PRAGMA user_version = {int(user_version)}")
+    con.commit()
+    con.execute("DETACH DATABASE src")
+    con.execute("ANALYZE")
+    con.commit()
+    con.close()
+
+
+# ---------- Page report ----------
+
+def canonical_queries(db_path: Path) -> list[tuple[str, str]]:
+    """The site's per-page queries, bound to the largest work's first verse."""
+    con = sqlite3.connect(str(db_path))
+    row = con.execute(
+        """
+        SELECT v.work_id, v.division_id, d.ordinal, v.ordinal, v.verse_id
+        FROM verses v JOIN divisions d ON d.division_id = v.division_id
+        WHERE v.work_id = (SELECT work_id FROM verses GROUP BY work_id ORDER BY COUNT(*) DESC LIMIT 1)
+        ORDER BY d.ordinal, v.ordinal LIMIT 1
+        """
+    ).fetchone()
+    con.close()
+    if not row:
+        return []
+    work, div, cord, vord, verse = (int(x) for x in row)
+    return [
+        ("index: works + counts",
+         "SELECT w.work_id, w.slug, w.title_en, w.author, w.work_type_code,"
+         " (SELECT COUNT(*) FROM divisions d WHERE d.work_id = w.work_id),"
+         " (SELECT COUNT(*) FROM verses v WHERE v.work_id = w.work_id)"
+         " FROM works w ORDER BY w.title_en"),
+        ("book: chapter list",
+         "SELECT d.division_id, d.ordinal, d.label, COUNT(v.verse_id) FROM divisions d"
+         f" JOIN verses v ON v.division_id = d.division_id WHERE d.work_id = {work}"
+         " GROUP BY d.division_id ORDER BY d.ordinal"),
+        ("chapter: verses",
+         "SELECT vw.verse_id, vw.ref_citation, vs.ordinal, vw.sa_deva, vw.sa_iast, vw.en_translation"
+         " FROM verse_texts_wide vw JOIN verses vs ON vs.verse_id = vw.verse_id"
+         f" WHERE vw.work_id = {work} AND vw.division_id = {div} ORDER BY vs.ordinal"),
+        ("chapter: word-by-word",
+         "SELECT w.verse_id, w.wfw_json FROM verse_wfw w JOIN verses v ON v.verse_id = w.verse_id"
+         f" WHERE v.division_id = {div}"),
+        ("verse: texts",
+         f"SELECT sa_deva, sa_iast, en_translation FROM verse_texts_wide WHERE verse_id = {verse}"),
+        ("verse: next",
+         "SELECT vs.verse_id, d.division_id, d.ordinal, vs.ordinal FROM verses vs"
+         f" JOIN divisions d ON d.division_id = vs.division_id WHERE vs.work_id = {work}"
+         f" AND (d.ordinal > {cord} OR (d.ordinal = {cord} AND vs.ordinal > {vord}))"
+         " ORDER BY d.ordinal ASC, vs.ordinal ASC LIMIT 1"),
+        ("search: all verses",
+         "SELECT vs.verse_id, vs.work_id, vs.division_id, vs.ordinal, d.ordinal, vs.ref_citation,"
+         " vw.sa_deva, vw.sa_iast, vw.en_translation, w.title_en, w.work_type_code"
+         " FROM verses vs JOIN verse_texts_wide vw ON vw.verse_id = vs.verse_id"
+         " JOIN divisions d ON d.division_id = vs.division_id JOIN works w ON w.work_id = vs.work_id"
+         " ORDER BY vs.work_id, d.ordinal, vs.ordinal"),
+        ("search: word-by-word", "SELECT verse_id, wfw FROM verse_wfw"),
+    ]
+
+
+def pages_read(sqlite_cli: str, db_path: Path, sql: str) -> int | None:
+    """Page cache misses for one statement on a fresh connection (schema already loaded)."""
+    # The shell resets the counters each time it prints them, so the schema
+    # load lands in the first block and the last block is the query alone.
+    script = f".stats on\nSELECT count(*) FROM sqlite_master;\n{sql};\n"
+    out = subprocess.run(
+        [sqlite_cli, "-readonly", str(db_path)], input=script, capture_output=True, text=True, check=True
+    ).stdout
+    misses = [line for line in out.splitlines() if line.startswith("Page cache misses:")]
+    return int(misses[-1].split(":")[1]) if misses else None
+
+
+def read_path_runs(db_path: Path) -> int | None:
+    """Contiguous page runs across the read-path tables and their indexes (needs dbstat)."""
+    con = sqlite3.connect(str(db_path))
+    try:
+        names = [n for (n,) in con.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name IN (%s)" % ",".join("?" * len(READ_ORDER)),
+            READ_ORDER,
+        )]
+        runs = 0
+        for name in names:
+            pages = [p for (p,) in con.execute("SELECT pageno FROM dbstat WHERE name = ? ORDER BY pageno", (name,))]
+            runs += sum(1 for i, p in enumerate(pages) if i == 0 or p != pages[i - 1] + 1)
+        return runs
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        con.close()
+
+
+def page_report(before: Path, after: Path) -> None:
+    for label, p in (("before", before), ("after", after)):
+        con = sqlite3.connect(str(p))
+        size, count = (con.execute(f"PRAGMA {k}").fetchone()[0] for k in ("page_size", "page_count"))
+        con.close()
+        runs = read_path_runs(p)
+        print(f"{label:>6}: page_size={size} page_count={count} read-path runs={runs if runs is not None else 'n/a'}")
+    sqlite_cli = shutil.which("sqlite3")
+    if not sqlite_cli:
+        print("sqlite3 CLI not found; skipping per-query page counts")
+        return
+    print(f"{'query':<24} {'before':>7} {'after':>7}")
+    for label, sql in canonical_queries(after):
+        b = pages_read(sqlite_cli, before, sql)
+        a = pages_read(sqlite_cli, after, sql)
+        print(f"{label:<24} {b if b is not None else 'n/a':>7} {a if a is not None else 'n/a':>7}")
+
+
+def finalize(db_path: Path, page_size: int, report: bool) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"Library SQLite not found: {db_path}")
+    tmp = db_path.with_name(db_path.name + ".layout")
+    clustered_copy(db_path, tmp, page_size)
+    if report:
+        page_report(db_path, tmp)
+    os.replace(tmp, db_path)
+    print(f"Finalized {db_path} (page_size={page_size})")
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Cluster and repage the library SQLite for HTTP range reads")
+    p.add_argument("--db", default=None, help="Library SQLite (default: docs/assets/data/library.*.sqlite)")
+    p.add_argument("--page-size", type=int, default=4096, help="SQLite page size in bytes (default: 4096)")
+    p.add_argument("--no-report", action="store_true", help="Skip the per-query page report")
+    return p.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    db_path = Path(args.db) if args.db else find_library_db()
+    finalize(db_path, args.page_size, not args.no_report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,12 +6,16 @@ python -m pip install -U pip
 pip install numpy
 pip install onnxruntime
 pip install tokenizers
+pip install onnx
 python run.py
 """
 
-import sqlite3, subprocess, sys
+import importlib.util, os, sqlite3, subprocess, sys
 from pathlib import Path
 
+from build_pooled_model import is_current
+from build_semantic_pack import iter_stored_vectors, vector_format
+
 HERE   = Path(__file__).resolve().parent
 DOCS   = HERE.parent
 ASSETS = DOCS / "assets"
@@ -35,12 +39,14 @@ def run(cmd: list[str]) -> None:
 
 def detect_dim(db_path: Path) -> int:
     con = sqlite3.connect(str(db_path))
-    cur = con.cursor()
-    row = cur.execute("SELECT vector FROM embeddings LIMIT 1").fetchone()
-    if not row or row[0] is None:
+    first = next(iter_stored_vectors(con), None)
+    if first is None or not first[1]:
         con.close()
         raise SystemExit("No embeddings found after encode_semantic.py")
-    dim = len(row[0]) // 4  # float32 bytes
+    fmt = vector_format(con)
+    n = len(first[1])
+    # f32: 4 bytes/dim, f16: 2, int8: float32 scale + 1 byte/dim
+    dim = {"f16": n // 2, "int8": n - 4}.get(fmt, n // 4)
     con.close()
     return dim
 
@@ -54,7 +60,12 @@ def set_meta(db_path: Path, dim: int) -> None:
 
 def main():
 
-    run([sys.executable, "build_library_sqlite_from_jsons.py"])
+    # Extra CLI args go to the importer, e.g. `python run.py --incremental`
+    run([sys.executable, "build_library_sqlite_from_jsons.py", "--bulk", "--fast-build",
+         "--workers", str(os.cpu_count() or 1), *sys.argv[1:]])
+
+    # Repage and cluster the library DB for HTTP range reads (ids and content unchanged)
+    run([sys.executable, "finalize_library_db.py"])
 
     # Verify required files live under docs/assets/data/semantic/onnx_model
     required = ["tokenizer.json", "model.onnx"]
@@ -64,17 +75,31 @@ def main():
 
     # 1) Build semantic DB from site content DB
     source_db = find_source_db()
-    run([sys.executable, "build_semantic_pack.py", "--source", str(source_db), "--out", str(SEM_DB)])
+    run([sys.executable, "build_semantic_pack.py", "--source", str(source_db), "--out", str(SEM_DB),
+         "--workers", str(os.cpu_count() or 1)])
 
     # 2) Overwrite embeddings in-place with transformer FP32
+    #    model_pooled.onnx is model.onnx with mean pooling + L2 norm in the graph;
+    #    building it needs `onnx`, without which the plain fp32 model is used.
     #    encode_semantic.py auto-discovers docs/assets/data/semantic and updates DB there.
-    run([sys.executable, "encode_semantic.py"])
+    model = "pooled"
+    if not is_current(ONNX / "model.onnx", ONNX / "model_pooled.onnx"):
+        if importlib.util.find_spec("onnx") is not None:
+            run([sys.executable, "build_pooled_model.py"])
+        else:
+            print("onnx not installed; encoding with model.onnx instead of model_pooled.onnx")
+            model = "fp32"
+    run([sys.executable, "encode_semantic.py", "--model", model])
 
     # 3) Fix meta to reflect transformer vectors
     dim = detect_dim(SEM_DB)
     set_meta(SEM_DB, dim)
 
-    # 4) Rebuild manifest.json in docs/assets/data/semantic
+    # 4) Raw embeddings.f32 + ids.u32 sidecars for Python tooling, in docs/scripts/.cache
+    #    (not shipped; the browser reads embedding_matrix from the pack)
+    run([sys.executable, "export_embedding_sidecars.py", "--db", str(SEM_DB)])
+
+    # 5) Rebuild manifest.json in docs/assets/data/semantic
     run([sys.executable, "build_semantic_manifest.py"])
 
     print("done")
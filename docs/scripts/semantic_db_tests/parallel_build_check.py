@@ -0,0 +1,55 @@
+# This script checks that build_semantic_pack.py --workers N produces the same semantic DB as the serial build.
+# It builds both from the library DB into a temp dir and compares full SQL dumps (only meta.built_at may differ).
+
+import sys
+import sqlite3
+import subprocess
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BUILD = HERE.parent / "build_semantic_pack.py"
+
+def autodetect_db() -> Path | None:
+    docs = HERE.parents[1]  # .../docs
+    cands = sorted(p for p in (docs / "assets" / "data").glob("library.*.sqlite"))
+    return cands[0] if cands else None
+
+def require_db_from_argv_or_autodetect() -> Path:
+    if len(sys.argv) > 1:
+        p = Path(sys.argv[1]).expanduser().resolve()
+        if not p.exists():
+            raise SystemExit(f"DB not found at CLI path: {p}")
+        return p
+    p = autodetect_db()
+    if not p:
+        raise SystemExit("Library DB not found. Pass path: python parallel_build_check.py /path/to/library.sqlite")
+    return p
+
+def build(source: Path, out: Path, *extra: str) -> None:
+    # Small shards so the parallel run really spreads verses over several workers
+    subprocess.run([sys.executable, str(BUILD), "--source", str(source), "--out", str(out), "--batch", "64", *extra],
+                   check=True, stdout=subprocess.DEVNULL)
+
+def dump(db_path: Path) -> list[str]:
+    with sqlite3.connect(str(db_path)) as con:
+        return [line for line in con.iterdump() if "'built_at'" not in line]
+
+def main():
+    source = require_db_from_argv_or_autodetect()
+    print(f"[parallel_build_check] source: {source}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serial, parallel = Path(tmp) / "serial.sqlite", Path(tmp) / "parallel.sqlite"
+        build(source, serial)
+        build(source, parallel, "--workers", "3")
+        a, b = dump(serial), dump(parallel)
+
+    print(f"[parallel_build_check] dump lines: serial={len(a)} parallel={len(b)}")
+    if a != b:
+        diff = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+        raise SystemExit(f"[parallel_build_check] outputs differ at dump line {diff}")
+    print("[parallel_build_check] OK")
+
+if __name__ == "__main__":
+    main()
@@ -29,14 +29,18 @@ def main():
     here = Path(__file__).resolve().parent         # .../docs/scripts/semantic_db_tests
     qa_quick = here / "quick_checks.py"
     qa_sanity = here / "sanity_report.py"
+    qa_parallel = here / "parallel_build_check.py"
+    qa_stream = here / "stream_reader_check.py"
 
-    if not qa_quick.exists() or not qa_sanity.exists():
+    if not all(p.exists() for p in (qa_quick, qa_sanity, qa_parallel, qa_stream)):
         raise SystemExit("semantic_db_tests scripts not found under docs/scripts/semantic_db_tests")
 
     db_path = find_db()
 
     run("Quick checks", qa_quick, str(db_path))
     run("Sanity report", qa_sanity, str(db_path))
+    run("Parallel build parity", qa_parallel)
+    run("Streaming reader", qa_stream)
 
     print("\nAll tests completed.")
 
@@ -0,0 +1,72 @@
+# This script checks the importer's --stream JSON reader (open_work_stream).
+# It parses a synthetic multi-chapter work, in json.dump's default and compact layouts, and the
+# bundled extras/json_samples, compares the result with json.load, and fails if the read buffer
+# grows much beyond one chapter.
+
+import io
+import json
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+import build_library_sqlite_from_jsons as importer  # noqa: E402
+
+SAMPLES = HERE.parents[2] / "extras" / "json_samples"
+
+def synthetic_work(chapters: int = 40, verses: int = 150) -> dict:
+    return {
+        "id": "synthetic", "short": "syn", "title": "Synthetic", "author": "n/a", "type": "test",
+        "chapters": [
+            {"chapter": c + 1, "verses": [
+                {"verse": v + 1, "sa": "अ" * 200, "iast": "a" * 200, "en": f"verse {c}.{v} " * 20,
+                 "score": 1.5 + v, "flag": v % 2 == 0, "none": None}
+                for v in range(verses)
+            ]}
+            for c in range(chapters)
+        ],
+    }
+
+def read_stream(text: str) -> tuple[dict, list, int]:
+    """Header, chapters and the largest buffer the reader held while parsing `text`."""
+    peak = 0
+    fill = importer._JsonStream._fill
+
+    def tracking_fill(self, size):
+        nonlocal peak
+        ok = fill(self, size)
+        peak = max(peak, len(self.buf))
+        return ok
+
+    importer._JsonStream._fill = tracking_fill
+    try:
+        header, chapters = importer.open_work_stream(io.StringIO(text))
+        return header, list(chapters), peak
+    finally:
+        importer._JsonStream._fill = fill
+
+def check(label: str, text: str, bound_chapters: bool) -> None:
+    data = json.loads(text)
+    header, chapters, peak = read_stream(text)
+    expected_header = {k: v for k, v in data.items() if k != "chapters"}
+    if header != expected_header or chapters != data["chapters"]:
+        raise SystemExit(f"[stream_reader_check] {label}: streamed work differs from json.load")
+    largest = max(len(json.dumps(c, ensure_ascii=False)) for c in data["chapters"])
+    print(f"[stream_reader_check] {label}: file={len(text)} chars, largest chapter={largest}, peak buffer={peak}")
+    # The buffer grows geometrically, so allow about two chapters plus a read chunk.
+    if bound_chapters and peak > 2 * largest + 2 * (1 << 16):
+        raise SystemExit(f"[stream_reader_check] {label}: buffer reached {peak} chars; not bounded by one chapter")
+
+def main():
+    work = synthetic_work()
+    check("synthetic json.dump", json.dumps(work, ensure_ascii=False), True)
+    check("synthetic compact", json.dumps(work, ensure_ascii=False, separators=(",", ":")), True)
+    for path in sorted(SAMPLES.glob("*.json")):
+        text = path.read_text(encoding="utf-8")
+        data = json.loads(text)
+        if isinstance(data, dict) and isinstance(data.get("chapters"), list) and data["chapters"]:
+            check(path.name, text, False)
+    print("[stream_reader_check] OK")
+
+if __name__ == "__main__":
+    main()
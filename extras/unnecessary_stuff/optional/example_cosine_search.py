@@ -8,22 +8,34 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 DB = ROOT / "assets" / "data" / "semantic" / "library.semantic.v01.sqlite"
 
+def load_matrix():
+    # embedding_matrix: row-ordered chunks in the pack's vector_format + uint32 ids
+    with sqlite3.connect(str(DB)) as con:
+        meta = dict(con.execute("SELECT key, value FROM meta"))
+        chunks = con.execute("SELECT ids, vectors FROM embedding_matrix ORDER BY chunk").fetchall()
+    fmt, dim = meta.get("vector_format", "f32"), int(meta["dim"])
+    ids = np.concatenate([np.frombuffer(i, dtype="<u4") for i, _ in chunks])
+    raw = b"".join(v for _, v in chunks)
+    if fmt == "f32":
+        mat = np.frombuffer(raw, dtype="<f4").reshape(len(ids), dim)
+    elif fmt == "f16":
+        mat = np.frombuffer(raw, dtype="<f2").reshape(len(ids), dim).astype(np.float32)
+    elif fmt == "int8":
+        rows = np.frombuffer(raw, dtype=np.uint8).reshape(len(ids), 4 + dim)
+        scale = rows[:, :4].copy().view("<f4")
+        mat = rows[:, 4:].view(np.int8).astype(np.float32) * scale
+    else:
+        raise SystemExit(f"example handles f32/f16/int8 packs, not {fmt}")
+    return ids, mat / (np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12)
+
 def cosine_topk(q, k=5):
     q = q.astype(np.float32)
     q /= np.linalg.norm(q) + 1e-12  # unit norm
-    with sqlite3.connect(str(DB)) as con:
-        cur = con.cursor()
-        rows = cur.execute("SELECT id, vector FROM embeddings").fetchall()
-    sims = []
-    for _id, blob in rows:
-        v = np.frombuffer(blob, dtype=np.float32)
-        sims.append((_id, float(np.dot(q, v))))  # dot == cosine for unit-norm
-    sims.sort(key=lambda x: x[1], reverse=True)
-    return sims[:k]
+    ids, mat = load_matrix()
+    sims = mat @ q  # dot == cosine for unit-norm rows
+    top = np.argsort(-sims)[:k]
+    return [(int(ids[i]), float(sims[i])) for i in top]
 
 # Example: use one DB vector as a fake query
-with sqlite3.connect(str(DB)) as con:
-    cur = con.cursor()
-    _, blob = cur.execute("SELECT id, vector FROM embeddings LIMIT 1 OFFSET 10").fetchone()
-q = np.frombuffer(blob, dtype=np.float32)
+q = load_matrix()[1][10].copy()
 print(cosine_topk(q, k=5))
@@ -2,11 +2,17 @@
 
 from pathlib import Path
 import sqlite3
+import sys
 import numpy as np
 
 ROOT = Path(__file__).resolve().parent.parent
 DB_PATH = ROOT / "assets" / "data" / "semantic" / "library.semantic.v01.sqlite"
 
+# Vectors live in embedding_matrix (embeddings is empty in a finished pack);
+# build_semantic_pack reads either layout
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "docs" / "scripts"))
+from build_semantic_pack import iter_stored_vectors, unpack_vector, vector_format  # noqa: E402
+
 def table_exists(cur, name):
     q = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
     return cur.execute(q, (name,)).fetchone() is not None
@@ -21,6 +27,7 @@ def main():
     print(f"DB: {DB_PATH}")
 
     # Meta
+    meta = {}
     if table_exists(cur, "meta"):
         meta = dict(cur.execute("SELECT key, value FROM meta").fetchall())
         print("meta keys:", sorted(meta.keys()))
@@ -30,23 +37,23 @@ def main():
     # Counts
     emb_n = cur.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] if table_exists(cur, "embeddings") else 0
     pas_n = cur.execute("SELECT COUNT(*) FROM passages").fetchone()[0] if table_exists(cur, "passages") else 0
-    print(f"rows: embeddings={emb_n}, passages={pas_n}")
+    mat_n = cur.execute("SELECT COALESCE(SUM(n_rows), 0) FROM embedding_matrix").fetchone()[0] if table_exists(cur, "embedding_matrix") else 0
+    print(f"rows: embeddings={emb_n}, embedding_matrix={mat_n}, passages={pas_n}")
+
+    vectors = list(iter_stored_vectors(con)) if emb_n or mat_n else []
 
     # Sample vector
-    if emb_n:
-        row = cur.execute("SELECT id, vector FROM embeddings LIMIT 1").fetchone()
-        vec = np.frombuffer(row[1], dtype=np.float32)
-        print(f"sample id: {row[0]}  shape: {vec.shape}  l2_norm: {np.linalg.norm(vec):.4f}")
+    if vectors and "dim" in meta:
+        pid, blob = vectors[0]
+        vec = np.frombuffer(unpack_vector(blob, int(meta["dim"]), vector_format(con)), dtype="<f4")
+        print(f"sample id: {pid}  shape: {vec.shape}  l2_norm: {np.linalg.norm(vec):.4f}")
 
     # Basic integrity check: 1-1 mapping if passages exist
-    if emb_n and pas_n:
-        mismatches = cur.execute("""
-            SELECT COUNT(*)
-            FROM passages p
-            LEFT JOIN embeddings e ON e.id = p.id
-            WHERE e.id IS NULL
-        """).fetchone()[0]
-        print(f"id mapping mismatches: {mismatches}")
+    if vectors and pas_n:
+        vec_ids = {pid for pid, _ in vectors}
+        pas_ids = {r[0] for r in cur.execute("SELECT id FROM passages")}
+        print(f"id mapping mismatches: {len(pas_ids - vec_ids)} passages without a vector, "
+              f"{len(vec_ids - pas_ids)} vectors without a passage")
 
     con.close()
 